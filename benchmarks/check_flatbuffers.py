@@ -0,0 +1,156 @@
+"""Check the FlatBuffers stream sender against a local stub listener.
+
+The sender encodes its frames by hand. This script decodes every kind it
+sends (register, color, image and clear) with the FlatBuffers runtime and
+compares them with what was sent, then streams large images to a host that
+reads slowly and checks that frames are dropped rather than queued and that
+none arrive torn.
+
+Requires ``homeassistant`` and ``flatbuffers`` to be installed. Example::
+
+    python benchmarks/check_flatbuffers.py
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fake_flatbuffers import FakeFlatBuffersServer, encode_reply  # noqa: E402
+
+from custom_components.hyperhdr_control.flatbuffer import (  # noqa: E402
+    HyperHDRFlatBufferSender,
+    _reply_error,
+)
+
+HOST = "127.0.0.1"
+ORIGIN = "Home Assistant"
+PRIORITY = 60
+
+
+async def async_wait_for(condition, timeout: float = 2.0) -> bool:
+    """Wait until a condition holds or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def async_check(args: argparse.Namespace) -> list[str]:
+    """Run the checks and return the failures."""
+    failures: list[str] = []
+
+    def check(ok: bool, description: str) -> None:
+        print(f"{'ok  ' if ok else 'FAIL'} {description}")
+        if not ok:
+            failures.append(description)
+
+    check(_reply_error(encode_reply("boom")[4:]) == "boom", "error reply is read")
+    check(_reply_error(encode_reply(registered=PRIORITY)[4:]) is None, "registered reply is clean")
+
+    server = FakeFlatBuffersServer()
+    server.reject_colors.add((1, 2, 3))
+    await server.start(HOST, args.port)
+    sender = HyperHDRFlatBufferSender(HOST, args.port, ORIGIN, PRIORITY)
+    requests = server.requests
+
+    check(not sender.send_color((0, 0, 0)), "first frame is dropped while connecting")
+    check(await async_wait_for(lambda: sender.connected), "sender connects")
+    check(await async_wait_for(lambda: len(requests) == 1), "register is received")
+    check(
+        requests[0] == {"command": "register", "origin": ORIGIN, "priority": PRIORITY},
+        f"register decodes: {requests[0]}",
+    )
+
+    sender.send_color((255, 128, 0))
+    await async_wait_for(lambda: len(requests) == 2)
+    check(
+        requests[-1] == {"command": "color", "color": (255, 128, 0), "duration": -1},
+        f"color decodes: {requests[-1]}",
+    )
+
+    for width, height in ((32, 18), (7, 5)):
+        pixels = bytes(index % 251 for index in range(width * height * 3))
+        await async_wait_for(lambda: sender.send_image(width, height, pixels))
+        count = len(requests)
+        await async_wait_for(lambda: len(requests) > count)
+        image = requests[-1]
+        check(
+            image["command"] == "image"
+            and (image["width"], image["height"]) == (width, height)
+            and image["pixels"] == pixels
+            and image["duration"] == -1,
+            f"{width}x{height} image decodes",
+        )
+
+    # A rejected frame is logged and the stream stays usable
+    sender.send_color((1, 2, 3))
+    await asyncio.sleep(0.05)
+    await async_wait_for(lambda: sender.send_color((4, 5, 6)))
+    await async_wait_for(lambda: requests[-1].get("color") == (4, 5, 6))
+    check(sender.connected and requests[-1]["color"] == (4, 5, 6), "stream survives an error reply")
+
+    # A slow host backs up the socket; frames must be dropped, never torn
+    server.read_delay = args.read_delay
+    requests.clear()
+    sender.frames_sent = sender.frames_dropped = 0
+    width, height = args.width, args.height
+    attempted = 0
+    started = time.monotonic()
+    while time.monotonic() - started < args.duration:
+        sender.send_image(width, height, bytes([attempted % 256]) * (width * height * 3))
+        attempted += 1
+        await asyncio.sleep(1 / args.fps)
+    server.read_delay = 0.0
+    await async_wait_for(lambda: len(requests) == sender.frames_sent, timeout=10)
+    frames = [request["pixels"] for request in requests]
+    check(sender.frames_dropped > 0, f"frames are dropped under backpressure: {sender.frames_dropped}")
+    check(
+        sender.frames_sent + sender.frames_dropped == attempted,
+        f"every frame is sent or dropped: {attempted} attempted, {sender.frames_sent} sent",
+    )
+    check(len(frames) == sender.frames_sent, f"every sent frame arrives: {len(frames)}")
+    check(
+        all(frame == frame[:1] * len(frame) for frame in frames),
+        "no frame arrives torn",
+    )
+
+    await sender.async_close()
+    await async_wait_for(lambda: requests[-1]["command"] == "clear")
+    check(
+        requests[-1] == {"command": "clear", "priority": PRIORITY},
+        f"clear decodes on close: {requests[-1]}",
+    )
+    await server.stop()
+    return failures
+
+
+def main() -> None:
+    """Parse arguments, run the checks and exit non-zero on failure."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=29400, help="Port of the stub listener")
+    parser.add_argument("--width", type=int, default=640, help="Width of the streamed images")
+    parser.add_argument("--height", type=int, default=360, help="Height of the streamed images")
+    parser.add_argument("--fps", type=float, default=60.0, help="Frames offered per second")
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds to stream")
+    parser.add_argument(
+        "--read-delay", type=float, default=0.05, help="Seconds the slow host spends per frame"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    failures = asyncio.run(async_check(args))
+    print(f"{len(failures)} failed" if failures else "all checks passed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
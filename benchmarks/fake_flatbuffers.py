@@ -0,0 +1,134 @@
+"""In-process fake HyperHDR FlatBuffers server for checking the stream sender."""
+from __future__ import annotations
+
+import asyncio
+import struct
+from typing import Any
+
+import flatbuffers
+from flatbuffers import number_types
+from flatbuffers.table import Table
+
+# Union member ids of Request.command and Image.data in the hyperionnet schema
+COMMAND_TYPES = {1: "color", 2: "image", 3: "clear", 4: "register"}
+IMAGE_TYPE_RAW = 1
+
+_SIZE = struct.Struct(">I")
+
+
+def _scalar(table: Table, slot: int, flags: Any, default: int) -> int:
+    """Return a scalar field of a table, or its schema default."""
+    offset = table.Offset(4 + 2 * slot)
+    return table.Get(flags, offset + table.Pos) if offset else default
+
+
+def _table(table: Table, slot: int) -> Table | None:
+    """Return the table a field points to."""
+    offset = table.Offset(4 + 2 * slot)
+    if not offset:
+        return None
+    return Table(table.Bytes, table.Indirect(offset + table.Pos))
+
+
+def decode_request(buffer: bytes | bytearray) -> dict[str, Any]:
+    """Decode a Request message with the FlatBuffers runtime."""
+    buffer = bytearray(buffer)
+    root = flatbuffers.encode.Get(number_types.UOffsetTFlags.packer_type, buffer, 0)
+    request = Table(buffer, root)
+    command_type = _scalar(request, 0, number_types.Uint8Flags, 0)
+    command = _table(request, 1)
+    if command is None or command_type not in COMMAND_TYPES:
+        raise ValueError(f"Request without a known command: {command_type}")
+
+    kind = COMMAND_TYPES[command_type]
+    if kind == "color":
+        data = _scalar(command, 0, number_types.Int32Flags, 0)
+        return {
+            "command": kind,
+            "color": ((data >> 16) & 0xFF, (data >> 8) & 0xFF, data & 0xFF),
+            "duration": _scalar(command, 1, number_types.Int32Flags, -1),
+        }
+    if kind == "clear":
+        return {"command": kind, "priority": _scalar(command, 0, number_types.Int32Flags, 0)}
+    if kind == "register":
+        offset = command.Offset(4)
+        return {
+            "command": kind,
+            "origin": command.String(offset + command.Pos).decode() if offset else None,
+            "priority": _scalar(command, 1, number_types.Int32Flags, 0),
+        }
+
+    image_type = _scalar(command, 0, number_types.Uint8Flags, 0)
+    raw = _table(command, 1)
+    if image_type != IMAGE_TYPE_RAW or raw is None:
+        raise ValueError(f"Image of unsupported type {image_type}")
+    offset = raw.Offset(4)
+    start = raw.Vector(offset)
+    return {
+        "command": kind,
+        "width": _scalar(raw, 1, number_types.Int32Flags, -1),
+        "height": _scalar(raw, 2, number_types.Int32Flags, -1),
+        "pixels": bytes(buffer[start : start + raw.VectorLen(offset)]),
+        "duration": _scalar(command, 2, number_types.Int32Flags, -1),
+    }
+
+
+def encode_reply(error: str | None = None, registered: int = -1) -> bytes:
+    """Encode a size-prefixed Reply message with the FlatBuffers runtime."""
+    builder = flatbuffers.Builder(64)
+    message = builder.CreateString(error) if error is not None else None
+    builder.StartObject(3)
+    if message is not None:
+        builder.PrependUOffsetTRelativeSlot(0, message, 0)
+    builder.PrependInt32Slot(2, registered, -1)
+    builder.Finish(builder.EndObject())
+    reply = builder.Output()
+    return _SIZE.pack(len(reply)) + reply
+
+
+class FakeFlatBuffersServer:
+    """Accept FlatBuffers clients on a local port and record their requests.
+
+    Every request is decoded with the FlatBuffers runtime, independently of
+    the integration's hand-encoded frames, and appended to ``requests``.
+    Registrations are answered like HyperHDR does. ``read_delay`` seconds
+    are spent after each request to simulate a host that cannot keep up,
+    which backs up the client's socket. A color listed in ``reject_colors``
+    is answered with an error reply.
+    """
+
+    def __init__(self, read_delay: float = 0.0) -> None:
+        """Initialize the fake server."""
+        self.read_delay = read_delay
+        self.reject_colors: set[tuple[int, int, int]] = set()
+        self.requests: list[dict[str, Any]] = []
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str, port: int) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def stop(self) -> None:
+        """Stop listening and drop the clients."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Decode the requests of one client until it disconnects."""
+        try:
+            while True:
+                (size,) = _SIZE.unpack(await reader.readexactly(_SIZE.size))
+                request = decode_request(await reader.readexactly(size))
+                self.requests.append(request)
+                if request["command"] == "register":
+                    writer.write(encode_reply(registered=request["priority"]))
+                elif request["command"] == "color" and request["color"] in self.reject_colors:
+                    writer.write(encode_reply(error="Color rejected"))
+                if self.read_delay:
+                    await asyncio.sleep(self.read_delay)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
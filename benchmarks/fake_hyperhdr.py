@@ -0,0 +1,243 @@
+"""In-process fake HyperHDR server for benchmarking the integration."""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import os
+import random
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+from aiohttp import web
+
+VERSION = "21.0.0.0"  # Version reported in serverinfo
+
+
+class FakeHyperHDR:
+    """Serve the HyperHDR JSON-RPC API on one or more local ports.
+
+    Every port behaves as an independent HyperHDR server with its own state.
+    ``latency`` delays every answer, ``error_rate`` is the share of requests
+    answered with HTTP 500 and ``effects`` sets the number of effects in the
+    serverinfo payload, which controls its size. The raw JSON server used
+    for push updates is only started when ``json_ports`` are given; it
+    streams ``frame_size`` bytes of preview image ``stream_fps`` times per
+    second to every client that sent ``imagestream-start``, and the colors
+    of ``leds`` LEDs laid out around the screen to every client that sent
+    ``ledstream-start``.
+
+    ``instances`` sets the number of LED instances per server. Each has its
+    own state; HTTP requests reach the first one, and a JSON client selects
+    one with ``instance`` ``switchTo``, which also moves its pushed updates.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        effects: int = 26,
+        seed: int | None = None,
+        stream_fps: float = 60.0,
+        frame_size: int = 20_000,
+        leds: int = 0,
+        instances: int = 1,
+    ) -> None:
+        """Initialize the fake server."""
+        self.instances = instances
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stream_fps = stream_fps
+        self.frames_sent = 0
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._effects = [
+            {"name": f"Effect {index}", "file": f":/effects/effect_{index}.json", "args": {}}
+            for index in range(effects)
+        ]
+        self._states: dict[tuple[int, int], dict[str, Any]] = {}
+        self._leds = self._layout(leds)
+        self._led_frames: dict[int, bytes] = {}
+        self._frame = (
+            json.dumps(
+                {
+                    "command": "ledcolors-imagestream-update",
+                    "result": {
+                        "image": "data:image/jpg;base64,"
+                        + base64.b64encode(os.urandom(frame_size)).decode()
+                    },
+                }
+            ).encode()
+            + b"\n"
+        )
+        self._runner: web.AppRunner | None = None
+        self._json_servers: list[asyncio.base_events.Server] = []
+
+    async def start(self, host: str, ports: list[int], json_ports: list[int] | None = None) -> None:
+        """Listen on the given HTTP ports and, optionally, JSON ports."""
+        app = web.Application()
+        app.router.add_get("/json-rpc", self._handle_http)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        for port in ports:
+            await web.TCPSite(self._runner, host, port).start()
+
+        for port in json_ports or []:
+            server = await asyncio.start_server(
+                lambda reader, writer, port=port: self._handle_json(port, reader, writer),
+                host,
+                port,
+            )
+            self._json_servers.append(server)
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        for server in self._json_servers:
+            server.close()
+        self._json_servers.clear()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @staticmethod
+    def _layout(count: int) -> list[dict[str, float]]:
+        """Place LEDs clockwise around the screen edges, starting top left."""
+        leds = []
+        for index in range(count):
+            position = index / count * 4
+            edge, offset = int(position), position % 1
+            x, y = [(offset, 0.0), (1.0, offset), (1 - offset, 1.0), (0.0, 1 - offset)][edge]
+            leds.append(
+                {
+                    "hmin": max(0.0, x - 0.05),
+                    "hmax": min(1.0, x + 0.05),
+                    "vmin": max(0.0, y - 0.05),
+                    "vmax": min(1.0, y + 0.05),
+                }
+            )
+        return leds
+
+    def _led_frame(self, frame: int) -> bytes:
+        """Return one LED color stream message with slowly drifting colors."""
+        frame %= 256
+        if frame in self._led_frames:
+            return self._led_frames[frame]
+        colors = []
+        for index, led in enumerate(self._leds):
+            colors += [(frame + index) % 256, int(led["hmin"] * 255), int(led["vmin"] * 255)]
+        self._led_frames[frame] = (
+            json.dumps({"command": "ledcolors-ledstream-update", "result": {"leds": colors}}).encode()
+            + b"\n"
+        )
+        return self._led_frames[frame]
+
+    def _state(self, port: int, instance: int = 0) -> dict[str, Any]:
+        """Return the mutable state of an instance of the server on a port."""
+        if (port, instance) not in self._states:
+            self._states[port, instance] = {
+                "components": {"LEDDEVICE": True, "VIDEOGRABBER": False},
+                "brightness": 100,
+                "color": None,
+            }
+        return self._states[port, instance]
+
+    def _serverinfo(self, port: int, instance: int = 0) -> dict[str, Any]:
+        """Build a serverinfo payload."""
+        state = self._state(port, instance)
+        return {
+            "components": [
+                {"name": name, "enabled": enabled}
+                for name, enabled in state["components"].items()
+            ],
+            "adjustment": [{"id": "default", "brightness": state["brightness"]}],
+            "effects": self._effects,
+            "leds": self._leds,
+            "priorities": (
+                [{"priority": 64, "componentId": "COLOR", "value": {"RGB": state["color"]}}]
+                if state["color"] is not None
+                else []
+            ),
+            "instance": [
+                {"instance": index, "friendly_name": f"Instance {index}", "running": True}
+                for index in range(self.instances)
+            ],
+            "hyperhdr": {"version": VERSION},
+        }
+
+    def _answer(self, port: int, request: dict[str, Any], instance: int = 0) -> dict[str, Any]:
+        """Apply a request to an instance and build its response."""
+        command = request.get("command", "")
+        self.requests[command] += 1
+        state = self._state(port, instance)
+        response: dict[str, Any] = {"command": command, "success": True, "tan": request.get("tan", 0)}
+
+        if command == "serverinfo":
+            response["info"] = self._serverinfo(port, instance)
+        elif command == "instance":
+            if not 0 <= request.get("instance", 0) < self.instances:
+                response.update(success=False, error="Instance does not exist")
+        elif command == "componentstate":
+            component = request.get("componentstate", {})
+            state["components"][component.get("component")] = component.get("state", False)
+        elif command == "adjustment":
+            state["brightness"] = request.get("adjustment", {}).get("brightness", 100)
+        elif command == "color":
+            state["color"] = request.get("color")
+        elif command == "clear":
+            state["color"] = None
+        return response
+
+    async def _handle_http(self, request: web.Request) -> web.Response:
+        """Answer one JSON-RPC request sent over HTTP."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.requests["error"] += 1
+            return web.Response(status=500, text="Injected error")
+
+        port = request.transport.get_extra_info("sockname")[1]
+        payload = json.loads(request.query["request"])
+        return web.json_response(self._answer(port, payload))
+
+    async def _handle_json(
+        self, port: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer newline-delimited requests on the raw JSON port."""
+
+        selected = 0
+
+        async def answer(payload: dict[str, Any], instance: int) -> None:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            writer.write(json.dumps(self._answer(port, payload, instance)).encode() + b"\n")
+
+        async def stream(build_frame: Callable[[int], bytes]) -> None:
+            frame = 0
+            while not writer.is_closing():
+                writer.write(build_frame(frame))
+                self.frames_sent += 1
+                frame += 1
+                await asyncio.sleep(1 / self.stream_fps)
+
+        streams: dict[str, asyncio.Task] = {}
+        try:
+            while line := await reader.readline():
+                payload = json.loads(line)
+                name, _, action = payload.get("subcommand", "").partition("-")
+                if action == "start" and name not in streams:
+                    build_frame = (lambda _: self._frame) if name == "imagestream" else self._led_frame
+                    streams[name] = asyncio.create_task(stream(build_frame))
+                elif action == "stop" and name in streams:
+                    streams.pop(name).cancel()
+                # Commands act on the instance selected when they arrive
+                asyncio.create_task(answer(payload, selected))
+                if payload.get("command") == "instance" and payload.get("subcommand") == "switchTo":
+                    if 0 <= payload.get("instance", 0) < self.instances:
+                        selected = payload["instance"]
+        except ConnectionError:
+            pass
+        finally:
+            for task in streams.values():
+                task.cancel()
+            writer.close()
@@ -0,0 +1,217 @@
+"""Benchmark the HyperHDR Control integration against a fake HyperHDR server.
+
+Runs a real Home Assistant core in-process, sets up the given number of
+config entries through ``async_setup_entry`` and reports setup time, serverinfo
+polls per second, command latency percentiles, open sockets and memory.
+
+Requires ``homeassistant`` to be installed. Example::
+
+    python benchmarks/run_benchmark.py --entries 1 10 50 200 --latency 0.005
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant  # noqa: I001 (must be imported before loader)
+from homeassistant import bootstrap, config_entries, loader
+from homeassistant.auth import auth_manager_from_config
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_hyperhdr import FakeHyperHDR  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DOMAIN = "hyperhdr_control"
+HOST = "127.0.0.1"
+BASE_PORT = 28000
+BASE_JSON_PORT = 29000
+UNUSED_JSON_PORT = 1  # Nothing listens here, so the integration falls back to polling
+HTTP_PORT = 28999  # Home Assistant HTTP server, required by the camera platform
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Return a percentile of the samples in milliseconds."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+def open_sockets() -> int | None:
+    """Return the number of sockets held by this process, where supported."""
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    count = 0
+    for fd in fds:
+        try:
+            count += os.readlink(f"/proc/self/fd/{fd}").startswith("socket:")
+        except OSError:
+            continue
+    return count
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    """Start a minimal Home Assistant core that loads custom integrations."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    await async_setup_component(hass, "homeassistant", {})
+    hass.auth = await auth_manager_from_config(hass, [], [])
+    await async_setup_component(hass, "http", {"http": {"server_port": HTTP_PORT}})
+    await hass.async_start()
+    return hass
+
+
+async def async_run(
+    args: argparse.Namespace, config_dir: str, entries: int
+) -> dict[str, Any]:
+    """Run one benchmark round with the given number of config entries."""
+    ports = [BASE_PORT + index for index in range(entries)]
+    json_ports = [BASE_JSON_PORT + index for index in range(entries)] if args.push else []
+    server = FakeHyperHDR(args.latency, args.error_rate, args.effects, seed=0)
+    await server.start(HOST, ports, json_ports)
+
+    # Every round starts without registries or snapshots from the previous one
+    shutil.rmtree(Path(config_dir) / ".storage", ignore_errors=True)
+    hass = await async_start_hass(config_dir)
+    sockets_before = open_sockets()
+    tracemalloc.start()
+
+    entries_to_add = [
+        ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title=f"HyperHDR {port}",
+            data={CONF_HOST: HOST, CONF_PORT: port},
+            source=config_entries.SOURCE_USER,
+            options={
+                CONF_SCAN_INTERVAL: args.scan_interval,
+                "json_port": json_ports[index] if args.push else UNUSED_JSON_PORT,
+            },
+            unique_id=f"{HOST}:{port}",
+        )
+        for index, port in enumerate(ports)
+    ]
+    # Effect buttons the user disabled are already in the registry
+    registry = er.async_get(hass)
+    for entry in entries_to_add:
+        for index in range(min(args.disabled_effects, args.effects)):
+            registry.async_get_or_create(
+                "button",
+                DOMAIN,
+                f"hyperhdr_effect_{HOST}_{entry.data[CONF_PORT]}_effect_{index}",
+                config_entry=entry,
+                disabled_by=er.RegistryEntryDisabler.USER,
+            )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(hass.config_entries.async_add(entry) for entry in entries_to_add))
+    await hass.async_block_till_done()
+    setup_time = time.perf_counter() - started
+
+    # Let the first refreshes land, then count polls over a fixed window
+    await asyncio.sleep(args.scan_interval)
+    polls_before = server.requests["serverinfo"]
+    await asyncio.sleep(args.poll_window)
+    polls_per_second = (server.requests["serverinfo"] - polls_before) / args.poll_window
+
+    switches = sorted(
+        state.entity_id
+        for state in hass.states.async_all("switch")
+        if state.entity_id.endswith("led_output") or "led_output_" in state.entity_id
+    )
+    latencies: list[float] = []
+    for index in range(args.commands):
+        entity_id = switches[index % len(switches)]
+        service = "turn_off" if index % 2 else "turn_on"
+        command_started = time.perf_counter()
+        await hass.services.async_call(
+            "switch", service, {"entity_id": entity_id}, blocking=True
+        )
+        latencies.append(time.perf_counter() - command_started)
+
+    entities = len(hass.states.async_all())
+    memory_current, memory_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    sockets_after = open_sockets()
+
+    await hass.async_stop(force=True)
+    await server.stop()
+
+    return {
+        "entries": entries,
+        "entities": entities,
+        "setup_s": round(setup_time, 3),
+        "polls_per_s": round(polls_per_second, 2),
+        "command_p50_ms": round(percentile(latencies, 0.50), 2),
+        "command_p99_ms": round(percentile(latencies, 0.99), 2),
+        "open_sockets": (
+            sockets_after - sockets_before
+            if sockets_after is not None and sockets_before is not None
+            else None
+        ),
+        "memory_mib": round(memory_current / 2**20, 2),
+        "memory_peak_mib": round(memory_peak / 2**20, 2),
+        "requests": dict(server.requests),
+    }
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark for each entry count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--latency", type=float, default=0.0, help="Server latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of HTTP 500 answers")
+    parser.add_argument("--effects", type=int, default=26, help="Effects in serverinfo")
+    parser.add_argument(
+        "--disabled-effects", type=int, default=0, help="Effect buttons disabled per server"
+    )
+    parser.add_argument("--scan-interval", type=int, default=2, help="Poll interval in seconds")
+    parser.add_argument("--poll-window", type=float, default=5.0, help="Seconds to count polls")
+    parser.add_argument("--commands", type=int, default=200, help="Switch commands to time")
+    parser.add_argument("--push", action="store_true", help="Serve the JSON port for push updates")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    # Home Assistant imports custom_components from the config directory once
+    # per process, so all rounds share one directory
+    config_dir = tempfile.mkdtemp()
+    os.symlink(REPO_ROOT / "custom_components", Path(config_dir) / "custom_components")
+    for entries in args.entries:
+        result = asyncio.run(async_run(args, config_dir, entries))
+        if args.json:
+            print(json.dumps(result))
+            continue
+        print(
+            f"{result['entries']:>4} entries, {result['entities']} entities: setup {result['setup_s']:.3f}s, "
+            f"{result['polls_per_s']:.1f} polls/s, "
+            f"command p50 {result['command_p50_ms']:.2f}ms p99 {result['command_p99_ms']:.2f}ms, "
+            f"sockets {result['open_sockets']}, "
+            f"memory {result['memory_mib']:.1f} MiB (peak {result['memory_peak_mib']:.1f} MiB)"
+        )
+    shutil.rmtree(config_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,302 @@
 """The HyperHDR Control integration."""
 from __future__ import annotations
 
+import logging
+from datetime import timedelta
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.const import CONF_HOST, CONF_PORT, Platform
-from homeassistant.helpers import device_registry as dr
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL, Platform
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    DOMAIN,
+    CONF_AMBIENT_SAMPLE_RATE,
+    CONF_AMBIENT_SENSORS,
+    CONF_FLATBUFFERS_PORT,
+    CONF_JSON_PORT,
+    CONF_PERFORMANCE_STATS,
+    DEFAULT_AMBIENT_SAMPLE_RATE,
+    DEFAULT_FLATBUFFERS_PORT,
+    DEFAULT_JSON_PORT,
+    DEFAULT_SCAN_INTERVAL,
+    STREAM_PRIORITY,
+)
+from .api import HyperHDRClient
+from .connection import HyperHDRJsonConnection
+from .commands import ORIGIN
+from .coordinator import STORAGE_VERSION, HyperHDRCoordinator
+from .discovery import async_get_probe_cache
+from .entity import HyperHDRInstanceInfo
+from .flatbuffer import HyperHDRFlatBufferSender
+from .scheduler import HyperHDRCommandScheduler
+from .services import async_setup_services
+from .stats import HyperHDRStats
 
-from .const import DOMAIN
+_LOGGER = logging.getLogger(__name__)
 
 # Define platforms to load
 PLATFORMS = [
     Platform.SWITCH,
     Platform.BUTTON,
     Platform.NUMBER,
+    Platform.SENSOR,
+    Platform.CAMERA,
+    Platform.LIGHT,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the HyperHDR Control services."""
+    async_setup_services(hass)
+    return True
+
+def _known_instances(data: dict[str, Any] | None) -> dict[int, str | None]:
+    """Return the names of the LED instances listed in coordinator data."""
+    instances: dict[int, str | None] = {0: None}
+    for instance in (data or {}).get("instances") or []:
+        instances[instance["instance"]] = instance["name"]
+    return instances
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up HyperHDR Control from a config entry."""
+    # One pooled client per host is shared by the coordinator and all entities
+    client = HyperHDRClient(entry.data[CONF_HOST], entry.data[CONF_PORT])
+
+    # Commands and refreshes are queued, coalesced and paced per host
+    scheduler = HyperHDRCommandScheduler(hass, client)
+
+    # One coordinator per host fetches serverinfo for all of its entities
+    scan_interval = timedelta(seconds=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+    coordinator = HyperHDRCoordinator(
+        hass,
+        client,
+        scheduler,
+        scan_interval,
+        f"{DOMAIN}.{entry.entry_id}",
+        parse_leds=entry.options.get(CONF_AMBIENT_SENSORS, False),
+    )
+    # Start from the last saved state, or from the answer to the discovery
+    # probe for a server that was just added; the first refresh runs in the
+    # background either way
+    await coordinator.async_load_snapshot()
+    probed = async_get_probe_cache(hass).async_pop(entry.data[CONF_HOST], entry.data[CONF_PORT])
+    if coordinator.data is None and probed is not None:
+        coordinator.async_adopt_serverinfo(probed)
+
+    # Every further LED instance known from the last run gets its own
+    # scheduler and coordinator, sharing the client and its connection;
+    # the entities of an instance share one description of its identity
+    host = entry.data[CONF_HOST]
+    port = entry.data[CONF_PORT]
+    version = (coordinator.data or {}).get("version")
+    instances: dict[int, dict[str, Any]] = {
+        0: {
+            "coordinator": coordinator,
+            "scheduler": scheduler,
+            "info": HyperHDRInstanceInfo(entry.entry_id, host, port, version=version),
+        }
+    }
+    for instance, name in _known_instances(coordinator.data).items():
+        if not instance:
+            continue
+        instance_scheduler = HyperHDRCommandScheduler(hass, client, instance)
+        instance_coordinator = HyperHDRCoordinator(
+            hass,
+            client,
+            instance_scheduler,
+            scan_interval,
+            f"{DOMAIN}.{entry.entry_id}.{instance}",
+            instance=instance,
+            instance_name=name,
+            effects=coordinator.effects,
+        )
+        await instance_coordinator.async_load_snapshot()
+        instances[instance] = {
+            "coordinator": instance_coordinator,
+            "scheduler": instance_scheduler,
+            "info": HyperHDRInstanceInfo(
+                entry.entry_id, host, port, instance, instance_coordinator.instance_name, version
+            ),
+        }
+
+    @callback
+    def _async_handle_push(instance: int, message: dict[str, Any]) -> None:
+        """Hand a pushed message to the coordinator of its instance."""
+        if (runtime := instances.get(instance)) is not None:
+            runtime["coordinator"].async_handle_push(message)
+
+    @callback
+    def _async_push_connected(connected: bool) -> None:
+        """Tell every instance whether the connection is up."""
+        for runtime in instances.values():
+            runtime["coordinator"].async_set_push_connected(connected)
+
+    @callback
+    def _async_instance_changed(instance: int) -> None:
+        """Catch up on the updates of the first instance missed while away."""
+        if not instance:
+            hass.async_create_task(coordinator.async_request_refresh())
+
+    # Keep a subscription open so state is pushed instead of polled, and
+    # pipeline commands for every instance over the same socket while it is up
+    connection = HyperHDRJsonConnection(
+        entry.data[CONF_HOST],
+        entry.options.get(CONF_JSON_PORT, DEFAULT_JSON_PORT),
+        _async_handle_push,
+        _async_push_connected,
+        _async_instance_changed,
+    )
+    client.set_connection(connection)
+
+    # Request statistics are only collected when enabled in the options
+    if entry.options.get(CONF_PERFORMANCE_STATS, False):
+        client.stats = connection.stats = HyperHDRStats()
+
+    # The LED color stream is only requested when the ambient sensors are enabled
+    analytics = None
+    if entry.options.get(CONF_AMBIENT_SENSORS, False):
+        # Imported here so numpy is only loaded when the sensors are enabled
+        from .analytics import HyperHDRLedAnalytics
+
+        analytics = HyperHDRLedAnalytics(
+            hass,
+            connection,
+            coordinator,
+            entry.options.get(CONF_AMBIENT_SAMPLE_RATE, DEFAULT_AMBIENT_SAMPLE_RATE),
+        )
+        analytics.async_start()
+
+    entry.async_create_background_task(
+        hass, connection.run(), f"{DOMAIN} {entry.data[CONF_HOST]} subscription"
+    )
+
+    # High-rate color and image input; connects on the first frame
+    stream = HyperHDRFlatBufferSender(
+        entry.data[CONF_HOST],
+        entry.options.get(CONF_FLATBUFFERS_PORT, DEFAULT_FLATBUFFERS_PORT),
+        ORIGIN,
+        STREAM_PRIORITY,
+    )
+
     # Store an instance of the "domain" that includes the host/port
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "host": entry.data[CONF_HOST],
         "port": entry.data[CONF_PORT],
+        "client": client,
+        "coordinator": coordinator,
+        "connection": connection,
+        "scheduler": scheduler,
+        "analytics": analytics,
+        "stream": stream,
+        "instances": instances,
     }
 
     # Register device
     device_registry = dr.async_get(hass)
     device_registry.async_get_or_create(
         config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, f"{entry.data[CONF_HOST]}:{entry.data[CONF_PORT]}")},
-        manufacturer="HyperHDR",
-        name=f"HyperHDR ({entry.data[CONF_HOST]})",
-        model="HyperHDR LED Controller",
-        sw_version="1.3.3",
+        **instances[0]["info"].device_info,
     )
 
     # Set up all platforms using the recommended method
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Other instances are refreshed once the JSON connection is up
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN} {entry.data[CONF_HOST]} first refresh"
+    )
+
+    # Instances are set up from the saved catalogue; reload when it changed
+    reloading = False
+
+    @callback
+    def _async_check_instances() -> None:
+        """Reload the entry when the server runs a different set of instances."""
+        nonlocal reloading
+        if reloading or coordinator.data is None:
+            return
+        if set(_known_instances(coordinator.data)) == set(instances):
+            return
+        reloading = True
+        _LOGGER.info("LED instances of %s changed, reloading", entry.data[CONF_HOST])
+        entry.async_create_background_task(
+            hass, _async_adopt_instances(), f"{DOMAIN} {entry.data[CONF_HOST]} instances"
+        )
+
+    async def _async_adopt_instances() -> None:
+        """Save the new catalogue so the reloaded entry is set up from it."""
+        await coordinator.async_save_snapshot()
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_instances))
+
+    @callback
+    def _async_check_version() -> None:
+        """Record a version the server reports after setup on its devices."""
+        nonlocal version
+        if coordinator.data is None or coordinator.data.get("version") in (None, version):
+            return
+        version = coordinator.data["version"]
+        for runtime in instances.values():
+            # Entities added later register their device from the shared info
+            device_info = runtime["info"].device_info
+            device_info["sw_version"] = version
+            device = device_registry.async_get_device(identifiers=device_info["identifiers"])
+            if device is not None:
+                device_registry.async_update_device(device.id, sw_version=version)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_version))
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    # Stop the LED stream while the connection is still up
+    if (analytics := hass.data[DOMAIN][entry.entry_id]["analytics"]) is not None:
+        await analytics.async_stop()
+
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        for runtime in data["instances"].values():
+            await runtime["coordinator"].async_shutdown()
+            await runtime["scheduler"].async_shutdown()
+        await data["client"].close()
+        await data["stream"].async_close()
+    elif analytics is not None:
+        analytics.async_start()
+
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached data of a deleted config entry."""
+    store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+    if (cached := await store.async_load()) is not None:
+        for instance in _known_instances(cached["data"]):
+            if instance:
+                await Store(
+                    hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.{instance}"
+                ).async_remove()
+    await store.async_remove()
 
-    return unload_ok 
\ No newline at end of file
+async def async_remove_config_entry_device(
+    hass: HomeAssistant, entry: ConfigEntry, device_entry: dr.DeviceEntry
+) -> bool:
+    """Allow removing the device of an LED instance the server no longer runs."""
+    if (entry_data := hass.data.get(DOMAIN, {}).get(entry.entry_id)) is None:
+        # An entry that is not loaded has no instances to protect
+        return True
+    current = set()
+    for runtime in entry_data["instances"].values():
+        current |= runtime["info"].device_info["identifiers"]
+    return not device_entry.identifiers & current
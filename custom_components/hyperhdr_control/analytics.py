@@ -0,0 +1,194 @@
+"""Ambient color analytics for HyperHDR Control integration."""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import HyperHDRError
+from .connection import HyperHDRJsonConnection
+from .const import EDGES
+from .coordinator import HyperHDRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STREAM_COMMAND = "ledcolors-ledstream-update"
+STREAM_CHECK_INTERVAL = timedelta(seconds=5)  # How often a silent stream is restarted
+WINDOW_SAMPLES = 10  # Samples averaged into every reading
+DARK_LUMA = 16  # LEDs darker than this are ignored for the dominant color, 0-255
+
+# Rec. 709 luma coefficients
+_LUMA_WEIGHTS = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+# Maps colors quantized to 3 bits per channel onto 512 histogram bins
+_BIN_WEIGHTS = np.array([64, 8, 1], dtype=np.intp)
+
+_LEDS_KEY = b'"leds"'
+
+
+class HyperHDRLedAnalytics:
+    """Derive ambient color readings from the HyperHDR LED color stream.
+
+    The stream is sampled at ``sample_rate`` frames per second; every other
+    frame is dropped on arrival without being parsed. Samples go into a
+    preallocated ring buffer of ``WINDOW_SAMPLES`` frames and each reading
+    is computed over the window with array operations on the whole strip.
+    Edge colors need the LED layout from serverinfo; each LED is assigned to
+    the screen edge its center is closest to.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: HyperHDRJsonConnection,
+        coordinator: HyperHDRCoordinator,
+        sample_rate: float,
+    ) -> None:
+        """Initialize the analytics."""
+        self._hass = hass
+        self._connection = connection
+        self._coordinator = coordinator
+        self._sample_interval = 1 / sample_rate
+        self._last_sample = 0.0
+        self._window: np.ndarray | None = None
+        self._window_index = 0
+        self._window_filled = 0
+        self._layout: list[list[float]] | None = None
+        self._edge_weights: np.ndarray | None = None
+        self._edge_present: np.ndarray | None = None
+        self._listeners: list[Callable[[], None]] = []
+        self._remove_stream_listener: Callable[[], None] | None = None
+        self._unsub_check: Callable[[], None] | None = None
+        self.reading: dict[str, Any] | None = None
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call a listener after every new reading; returns a function to remove it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @callback
+    def async_start(self) -> None:
+        """Listen for LED frames and keep the stream running."""
+        self._remove_stream_listener = self._connection.add_stream_listener(
+            STREAM_COMMAND, self._handle_frame
+        )
+        self._unsub_check = async_track_time_interval(
+            self._hass, self._async_check_stream, STREAM_CHECK_INTERVAL
+        )
+
+    async def async_stop(self) -> None:
+        """Stop listening and ask HyperHDR to stop streaming."""
+        if self._unsub_check is not None:
+            self._unsub_check()
+            self._unsub_check = None
+        if self._remove_stream_listener is not None:
+            self._remove_stream_listener()
+            self._remove_stream_listener = None
+        if not self._connection.connected:
+            return
+        try:
+            await self._connection.request({"command": "ledcolors", "subcommand": "ledstream-stop"})
+        except HyperHDRError as error:
+            _LOGGER.debug("Could not stop the LED stream on %s: %s", self._coordinator.client.host, error)
+
+    async def _async_check_stream(self, _now: Any) -> None:
+        """Start the LED stream if no frame arrived recently."""
+        if not self._connection.connected:
+            return
+        if time.monotonic() - self._last_sample < STREAM_CHECK_INTERVAL.total_seconds():
+            return
+        try:
+            await self._connection.request({"command": "ledcolors", "subcommand": "ledstream-start"})
+        except HyperHDRError as error:
+            _LOGGER.debug("Could not start the LED stream on %s: %s", self._coordinator.client.host, error)
+
+    @callback
+    def _handle_frame(self, line: bytes) -> None:
+        """Sample a streamed frame unless one was sampled within the interval."""
+        now = time.monotonic()
+        if now - self._last_sample < self._sample_interval:
+            return
+        self._last_sample = now
+
+        if (colors := self._parse_frame(line)) is None:
+            return
+        self._add_sample(colors)
+        self.reading = self._compute()
+        for listener in list(self._listeners):
+            listener()
+
+    @staticmethod
+    def _parse_frame(line: bytes) -> np.ndarray | None:
+        """Read the flat RGB list of a stream message into an (n, 3) array."""
+        key = line.find(_LEDS_KEY)
+        start = line.find(b"[", key)
+        end = line.find(b"]", start)
+        if key == -1 or start == -1 or end == -1:
+            return None
+        values = np.fromstring(line[start + 1 : end].decode(), dtype=np.float32, sep=",")
+        if not values.size or values.size % 3:
+            return None
+        return values.reshape(-1, 3)
+
+    def _add_sample(self, colors: np.ndarray) -> None:
+        """Write a sample into the ring buffer, resizing it if the strip changed."""
+        if self._window is None or self._window.shape[1] != len(colors):
+            self._window = np.empty((WINDOW_SAMPLES, len(colors), 3), dtype=np.float32)
+            self._window_index = self._window_filled = 0
+        self._window[self._window_index] = colors
+        self._window_index = (self._window_index + 1) % WINDOW_SAMPLES
+        self._window_filled = min(self._window_filled + 1, WINDOW_SAMPLES)
+
+    def _compute(self) -> dict[str, Any]:
+        """Compute a reading over the samples in the window."""
+        colors = self._window[: self._window_filled].mean(axis=0)
+        luma = colors @ _LUMA_WEIGHTS
+
+        lit = luma >= DARK_LUMA
+        candidates = colors[lit] if lit.any() else colors
+        bins = (candidates // 32).astype(np.intp) @ _BIN_WEIGHTS
+        dominant = candidates[bins == np.bincount(bins).argmax()].mean(axis=0)
+
+        edges: dict[str, tuple[int, int, int] | None] = dict.fromkeys(EDGES)
+        if self._update_edge_weights(len(colors)):
+            for edge, color, present in zip(
+                EDGES, self._edge_weights @ colors, self._edge_present
+            ):
+                if present:
+                    edges[edge] = _rgb(color)
+
+        return {
+            "dominant_color": _rgb(dominant),
+            "luminance": round(float(luma.mean()) / 255 * 100, 1),
+            "edges": edges,
+        }
+
+    def _update_edge_weights(self, led_count: int) -> bool:
+        """Rebuild the edge averaging matrix when the LED layout changes."""
+        data = self._coordinator.data
+        layout = data.get("leds") if data else None
+        if layout is not self._layout:
+            self._layout = layout
+            self._edge_weights = self._edge_present = None
+            if layout:
+                bounds = np.asarray(layout, dtype=np.float32)
+                center_x = bounds[:, 0:2].mean(axis=1)
+                center_y = bounds[:, 2:4].mean(axis=1)
+                distance = np.stack([center_y, 1 - center_y, center_x, 1 - center_x])
+                members = distance.argmin(axis=0) == np.arange(len(EDGES))[:, None]
+                counts = members.sum(axis=1)
+                self._edge_weights = members / np.maximum(counts, 1)[:, None]
+                self._edge_present = counts > 0
+        return self._edge_weights is not None and self._edge_weights.shape[1] == led_count
+
+
+def _rgb(color: np.ndarray) -> tuple[int, int, int]:
+    """Round an RGB array to a tuple of ints."""
+    red, green, blue = np.clip(np.rint(color), 0, 255).astype(int).tolist()
+    return red, green, blue
@@ -0,0 +1,248 @@
+"""Client for the HyperHDR JSON-RPC API."""
+from __future__ import annotations
+
+import json
+import logging
+import random
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import async_timeout
+
+if TYPE_CHECKING:
+    from .connection import HyperHDRJsonConnection
+    from .stats import HyperHDRStats
+
+_LOGGER = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = 10  # Seconds before a request is abandoned
+KEEPALIVE_TIMEOUT = 60  # Seconds an idle connection is kept open
+DNS_CACHE_TTL = 300  # Seconds a resolved host name is cached
+CONNECTION_LIMIT = 4  # Maximum simultaneous connections to one host
+FAILURE_THRESHOLD = 3  # Consecutive failures before the circuit opens
+PROBE_MIN_DELAY = 5.0  # Seconds before the first probe of an open circuit
+PROBE_MAX_DELAY = 300.0  # Upper bound for the probe backoff
+
+
+class HyperHDRError(Exception):
+    """Base error for HyperHDR requests."""
+
+
+class HyperHDRConnectionError(HyperHDRError):
+    """Error raised when HyperHDR cannot be reached or rejects a request."""
+
+
+class HyperHDRTimeoutError(HyperHDRConnectionError):
+    """Error raised when HyperHDR does not answer in time."""
+
+
+class HyperHDRCircuitOpenError(HyperHDRConnectionError):
+    """Error raised without a request while HyperHDR is considered unreachable."""
+
+
+class HyperHDRCircuitBreaker:
+    """Track the health of one host and fail fast while it is unreachable.
+
+    After ``FAILURE_THRESHOLD`` consecutive connection failures the circuit
+    opens and requests are rejected without touching the network. Once the
+    backoff delay has passed a single probe request is let through; success
+    closes the circuit, failure reopens it with a doubled, jittered delay.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the circuit breaker."""
+        self._failures = 0
+        self._opened = 0
+        self._retry_at = 0.0
+        self._probing = False
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are rejected."""
+        return self._opened > 0
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next probe is allowed."""
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener whenever the circuit opens, reopens or closes."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        if not self.is_open:
+            return True
+        if self._probing or time.monotonic() < self._retry_at:
+            return False
+        self._probing = True
+        return True
+
+    def abort_request(self) -> None:
+        """Forget a probe that ended without a recorded outcome."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self._failures = 0
+        self._probing = False
+        if self.is_open:
+            self._opened = 0
+            self._notify()
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the circuit past the threshold."""
+        self._failures += 1
+        self._probing = False
+        if self._failures < FAILURE_THRESHOLD:
+            return
+
+        delay = min(PROBE_MAX_DELAY, PROBE_MIN_DELAY * 2**self._opened)
+        self._opened += 1
+        self._retry_at = time.monotonic() + delay * random.uniform(0.5, 1.0)
+        self._notify()
+
+    def _notify(self) -> None:
+        """Inform the listeners of a state change."""
+        for listener in list(self._listeners):
+            listener()
+
+
+class HyperHDRClient:
+    """Send JSON-RPC commands to one HyperHDR host.
+
+    Commands are pipelined over the persistent JSON connection when it is
+    established. Otherwise they fall back to HTTP over a pooled session that
+    keeps connections alive and caches DNS lookups, so repeated commands
+    reuse an open socket instead of reconnecting every time.
+
+    Requests fail fast while the circuit breaker considers the host down.
+    HTTP requests always reach the first LED instance, so commands for other
+    instances need the JSON connection.
+    """
+
+    def __init__(
+        self, host: str, port: int, session: aiohttp.ClientSession | None = None
+    ) -> None:
+        """Initialize the client, optionally on a session owned by the caller."""
+        self._host = host
+        self._port = port
+        self._url = f"http://{host}:{port}/json-rpc"
+        self._session = session
+        self._owns_session = session is None
+        self._connection: HyperHDRJsonConnection | None = None
+        self.circuit = HyperHDRCircuitBreaker()
+        self.stats: HyperHDRStats | None = None
+
+    @property
+    def host(self) -> str:
+        """Return the host this client talks to."""
+        return self._host
+
+    @property
+    def port(self) -> int:
+        """Return the port this client talks to."""
+        return self._port
+
+    def set_connection(self, connection: HyperHDRJsonConnection) -> None:
+        """Route commands over a JSON connection whenever it is established."""
+        self._connection = connection
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=CONNECTION_LIMIT,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                use_dns_cache=True,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def send(self, command: dict[str, Any], instance: int = 0) -> dict[str, Any]:
+        """Send a command to an LED instance and return the decoded JSON response."""
+        connected = self._connection is not None and self._connection.connected
+        if instance and not connected:
+            raise HyperHDRConnectionError(
+                f"Instance {instance} can only be reached over the JSON connection"
+            )
+        if not self.circuit.allow_request():
+            raise HyperHDRCircuitOpenError(
+                f"{self._host} is unreachable, next attempt in {self.circuit.retry_in:.0f}s"
+            )
+
+        stats = self.stats
+        started = time.monotonic() if stats is not None else 0.0
+        try:
+            if connected:
+                response = await self._connection.request(command, instance=instance)
+            else:
+                response = await self._send_http(command)
+        except HyperHDRConnectionError as error:
+            self.circuit.record_failure()
+            if stats is not None and isinstance(error, HyperHDRTimeoutError):
+                stats.record_timeout()
+            raise
+        except HyperHDRError:
+            # The host answered, it just rejected the command
+            self.circuit.record_success()
+            raise
+        else:
+            self.circuit.record_success()
+        finally:
+            # A probe that was cancelled or failed unexpectedly must not
+            # keep every later request out
+            self.circuit.abort_request()
+
+        if stats is not None:
+            stats.record_request(command.get("command", ""), time.monotonic() - started)
+        return response
+
+    async def _send_http(self, command: dict[str, Any]) -> dict[str, Any]:
+        """Send a command as an HTTP GET with the JSON in the query string."""
+        params = {"request": json.dumps(command, separators=(',', ':'))}
+        _LOGGER.debug("Sending request to %s with params: %s", self._url, params)
+
+        try:
+            async with async_timeout.timeout(REQUEST_TIMEOUT):
+                async with self._get_session().get(self._url, params=params) as response:
+                    if response.status != 200:
+                        if self.stats is not None:
+                            self.stats.record_http_error()
+                        response_text = await response.text()
+                        raise HyperHDRConnectionError(
+                            f"Unexpected status {response.status}: {response_text}"
+                        )
+                    body = await response.read()
+        except TimeoutError as error:
+            raise HyperHDRTimeoutError(
+                f"No response to {command.get('command')} within {REQUEST_TIMEOUT}s"
+            ) from error
+        except aiohttp.ClientError as error:
+            raise HyperHDRConnectionError(str(error) or type(error).__name__) from error
+
+        started = time.perf_counter()
+        try:
+            data = json.loads(body)
+        except ValueError as error:
+            # The host answered, so this is not a connection failure
+            raise HyperHDRError(
+                f"Malformed response to {command.get('command')}: {error}"
+            ) from error
+        if self.stats is not None and command.get("command") == "serverinfo":
+            self.stats.record_serverinfo(len(body), time.perf_counter() - started)
+        return data
+
+    async def close(self) -> None:
+        """Close the pooled session and its connections, unless it was passed in."""
+        if not self._owns_session:
+            return
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
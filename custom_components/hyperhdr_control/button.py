@@ -1,84 +1,135 @@
 """Button platform for HyperHDR Control integration."""
 from __future__ import annotations
 
-import json
 import logging
 from typing import Any
 
-import aiohttp
-import async_timeout
-from homeassistant.components.button import ButtonEntity
+from homeassistant.components.button import DOMAIN as BUTTON_DOMAIN, ButtonEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, AVAILABLE_EFFECTS
+from .api import HyperHDRError
+from .commands import effect_command
+from .const import CONF_OPTIMISTIC, DOMAIN
+from .coordinator import HyperHDRCoordinator
+from .entity import HyperHDRCoordinatorEntity, HyperHDRInstanceInfo
+from .scheduler import HyperHDRCommandScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+def effect_unique_id(info: HyperHDRInstanceInfo, effect_name: str) -> str:
+    """Return the unique ID of the button starting an effect."""
+    return f"hyperhdr_effect_{info.unique_id}_{effect_name.lower().replace(' ', '_')}"
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the HyperHDR Control buttons."""
-    host = entry.data[CONF_HOST]
-    port = entry.data[CONF_PORT]
-    
-    entities = []
-    for effect in AVAILABLE_EFFECTS:
-        entities.append(HyperHDREffectButton(entry.entry_id, host, port, effect))
-    
-    async_add_entities(entities, True)
-
-class HyperHDREffectButton(ButtonEntity):
+    for runtime in hass.data[DOMAIN][entry.entry_id]["instances"].values():
+        _async_setup_effects(
+            hass,
+            entry,
+            async_add_entities,
+            runtime["coordinator"],
+            runtime["scheduler"],
+            runtime["info"],
+        )
+
+@callback
+def _async_setup_effects(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    coordinator: HyperHDRCoordinator,
+    scheduler: HyperHDRCommandScheduler,
+    info: HyperHDRInstanceInfo,
+) -> None:
+    """Keep one button per effect of an LED instance.
+
+    Buttons disabled in the entity registry are never created; enabling
+    one reloads the entry, which creates it then.
+    """
+    optimistic = entry.options.get(CONF_OPTIMISTIC, True)
+    buttons: dict[str, HyperHDREffectButton | None] = {}
+    effects_hash: str | None = None
+
+    @callback
+    def _async_sync_effects() -> None:
+        """Add and remove buttons so they match the effect catalogue."""
+        nonlocal effects_hash
+        if coordinator.effects_hash == effects_hash:
+            return
+        effects_hash = coordinator.effects_hash
+
+        effects = set(coordinator.effects)
+        registry = er.async_get(hass)
+        for effect in set(buttons) - effects:
+            button = buttons.pop(effect)
+            entity_id = registry.async_get_entity_id(
+                BUTTON_DOMAIN, DOMAIN, effect_unique_id(info, effect)
+            )
+            if entity_id is not None:
+                registry.async_remove(entity_id)
+            elif button is not None:
+                hass.async_create_task(button.async_remove())
+
+        entities = []
+        for effect in coordinator.effects:
+            if effect in buttons:
+                continue
+            unique_id = effect_unique_id(info, effect)
+            entity_id = registry.async_get_entity_id(BUTTON_DOMAIN, DOMAIN, unique_id)
+            if entity_id is not None and registry.entities[entity_id].disabled:
+                buttons[effect] = None
+                continue
+            buttons[effect] = HyperHDREffectButton(
+                coordinator, scheduler, info, effect, unique_id, optimistic
+            )
+            entities.append(buttons[effect])
+        
+        if entities:
+            async_add_entities(entities)
+
+    # Start from the cached catalogue, then follow changes reported by the server
+    _async_sync_effects()
+    entry.async_on_unload(coordinator.async_add_listener(_async_sync_effects))
+
+class HyperHDREffectButton(HyperHDRCoordinatorEntity, ButtonEntity):
     """Representation of a HyperHDR Effect button."""
 
-    def __init__(self, entry_id: str, host: str, port: int, effect_name: str) -> None:
+    def __init__(
+        self,
+        coordinator: HyperHDRCoordinator,
+        scheduler: HyperHDRCommandScheduler,
+        info: HyperHDRInstanceInfo,
+        effect_name: str,
+        unique_id: str,
+        optimistic: bool = True,
+    ) -> None:
         """Initialize the button."""
-        self._entry_id = entry_id
-        self._host = host
-        self._port = port
+        super().__init__(coordinator, info)
+        self._scheduler = scheduler
+        self._optimistic = optimistic
         self._effect_name = effect_name
-        self._attr_name = f"HyperHDR Effect {effect_name}"
-        self._attr_unique_id = f"hyperhdr_effect_{host}_{port}_{effect_name.lower().replace(' ', '_')}"
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information about this HyperHDR instance."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{self._host}:{self._port}")},
-            manufacturer="HyperHDR",
-            name=f"HyperHDR ({self._host})",
-            model="HyperHDR LED Controller",
-            sw_version="1.3.3",
-        )
+        self._attr_name = info.entity_name(f"Effect {effect_name}")
+        self._attr_unique_id = unique_id
 
     async def async_press(self) -> None:
-        """Handle the button press."""
-        request_data = {
-            "command": "effect",
-            "effect": {
-                "name": self._effect_name
-            },
-            "duration": 0,
-            "priority": 64,
-            "origin": "Home Assistant"
-        }
-        
+        """Handle the button press, returning before the effect is confirmed if optimistic."""
+        if self._optimistic:
+            self.hass.async_create_background_task(
+                self._async_activate(), f"hyperhdr effect {self._effect_name}"
+            )
+            return
+        await self._async_activate()
+
+    async def _async_activate(self) -> None:
+        """Start the effect on HyperHDR."""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"http://{self._host}:{self._port}/json-rpc"
-                params = {"request": json.dumps(request_data, separators=(',', ':'))}
-                _LOGGER.debug("Sending request to %s with params: %s", url, params)
-                
-                async with async_timeout.timeout(10):
-                    async with session.get(url, params=params) as response:
-                        if response.status != 200:
-                            _LOGGER.error("Failed to activate effect: %s", response.status)
-                            response_text = await response.text()
-                            _LOGGER.error("Response: %s", response_text)
-        except (aiohttp.ClientError, TimeoutError) as error:
-            _LOGGER.error("Error activating effect: %s", error) 
\ No newline at end of file
+            await self._scheduler.submit("effect", effect_command(self._effect_name))
+        except HyperHDRError as error:
+            _LOGGER.error("Error activating effect: %s", error)
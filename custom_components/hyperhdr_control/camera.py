@@ -0,0 +1,202 @@
+"""Camera platform for HyperHDR Control integration."""
+from __future__ import annotations
+
+import binascii
+import json
+import logging
+import time
+from datetime import datetime
+
+from homeassistant.components.camera import Camera
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+
+from .api import HyperHDRError
+from .connection import HyperHDRJsonConnection
+from .const import CONF_CAMERA_FPS, DEFAULT_CAMERA_FPS, DOMAIN
+from .entity import HyperHDRInstanceInfo
+
+_LOGGER = logging.getLogger(__name__)
+
+STREAM_COMMAND = "ledcolors-imagestream-update"
+VIEWER_IDLE_TIMEOUT = 10  # Seconds without a frame request before the stream stops
+STREAM_STALL_TIMEOUT = 5  # Seconds without a frame before the stream is restarted
+
+_DATA_URL_PREFIX = b'"data:'
+_BASE64_MARKER = b";base64,"
+
+
+def _decode_frame(line: bytes) -> tuple[str, bytes] | None:
+    """Return the content type and image of a raw image stream message.
+
+    The base64 payload is decoded straight out of the received line, so no
+    JSON tree or intermediate string is built for it. Lines with escaped
+    characters in the payload fall back to a full parse.
+    """
+    start = line.find(_DATA_URL_PREFIX)
+    if start == -1:
+        return None
+    marker = line.find(_BASE64_MARKER, start)
+    if marker == -1:
+        return None
+    end = line.find(b'"', marker)
+    if end == -1:
+        return None
+
+    content_type = line[start + len(_DATA_URL_PREFIX) : marker].decode()
+    if content_type == "image/jpg":
+        content_type = "image/jpeg"
+    try:
+        if line.find(b"\\", marker, end) == -1:
+            image = binascii.a2b_base64(memoryview(line)[marker + len(_BASE64_MARKER) : end])
+        else:
+            data_url = json.loads(line)["result"]["image"]
+            image = binascii.a2b_base64(data_url.partition(",")[2])
+    except (binascii.Error, KeyError, TypeError, ValueError):
+        return None
+    return content_type, image
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the HyperHDR Control camera."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    fps = entry.options.get(CONF_CAMERA_FPS, DEFAULT_CAMERA_FPS)
+
+    async_add_entities(
+        [HyperHDRPreviewCamera(data["connection"], data["instances"][0]["info"], fps)]
+    )
+
+
+class HyperHDRPreviewCamera(Camera):
+    """Live preview of the image HyperHDR is processing.
+
+    The server-side image stream is started when the first frame is
+    requested and stopped again once nobody has asked for one for
+    ``VIEWER_IDLE_TIMEOUT`` seconds. Incoming frames are decimated to the
+    configured rate as they arrive: a dropped frame costs one peek at its
+    command name, and a kept one is only referenced until the next arrives.
+    Decoding happens when a viewer actually requests the image.
+    """
+
+    _attr_name = "HyperHDR Live Preview"
+
+    def __init__(
+        self,
+        connection: HyperHDRJsonConnection,
+        info: HyperHDRInstanceInfo,
+        fps: int,
+    ) -> None:
+        """Initialize the camera."""
+        super().__init__()
+        self._connection = connection
+        self._host = info.host
+        self._attr_unique_id = f"hyperhdr_preview_{info.unique_id}"
+        self._attr_device_info = info.device_info
+        self._attr_frame_interval = 1 / fps
+        self._frame: bytes | None = None
+        self._frame_received = 0.0
+        self._decoded_frame: bytes | None = None
+        self._image: bytes | None = None
+        self._stream_requested = 0.0
+        self._remove_listener: CALLBACK_TYPE | None = None
+        self._cancel_idle: CALLBACK_TYPE | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return True while the JSON connection is up."""
+        return self._connection.connected
+
+    async def async_added_to_hass(self) -> None:
+        """Listen for streamed frames and for the connection state."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._connection.add_connection_listener(self.async_write_ha_state)
+        )
+        self._remove_listener = self._connection.add_stream_listener(
+            STREAM_COMMAND, self._handle_frame
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop the stream and the frame listener."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        await self._async_stop_stream()
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _handle_frame(self, line: bytes) -> None:
+        """Keep a streamed frame unless one was kept within the frame interval."""
+        now = time.monotonic()
+        if now - self._frame_received < self._attr_frame_interval:
+            return
+        self._frame = line
+        self._frame_received = now
+
+    async def async_camera_image(
+        self, width: int | None = None, height: int | None = None
+    ) -> bytes | None:
+        """Return the latest preview frame, starting the stream if needed."""
+        self._schedule_idle_stop()
+        now = time.monotonic()
+        stalled = now - max(self._frame_received, self._stream_requested) > STREAM_STALL_TIMEOUT
+        if not self._attr_is_streaming or stalled:
+            await self._async_start_stream()
+
+        frame = self._frame
+        if frame is not None and frame is not self._decoded_frame:
+            self._decoded_frame = frame
+            if (decoded := _decode_frame(frame)) is not None:
+                self.content_type, self._image = decoded
+        return self._image
+
+    async def _async_start_stream(self) -> None:
+        """Ask HyperHDR to stream preview images."""
+        self._stream_requested = time.monotonic()
+        try:
+            await self._connection.request(
+                {"command": "ledcolors", "subcommand": "imagestream-start"}
+            )
+        except HyperHDRError as error:
+            _LOGGER.debug("Could not start the preview stream on %s: %s", self._host, error)
+            return
+        self._attr_is_streaming = True
+        self.async_write_ha_state()
+
+    async def _async_stop_stream(self) -> None:
+        """Ask HyperHDR to stop streaming and drop the kept frames."""
+        if self._cancel_idle is not None:
+            self._cancel_idle()
+            self._cancel_idle = None
+        self._frame = self._decoded_frame = self._image = None
+        if not self._attr_is_streaming:
+            return
+        self._attr_is_streaming = False
+        try:
+            await self._connection.request(
+                {"command": "ledcolors", "subcommand": "imagestream-stop"}
+            )
+        except HyperHDRError as error:
+            _LOGGER.debug("Could not stop the preview stream on %s: %s", self._host, error)
+
+    @callback
+    def _schedule_idle_stop(self) -> None:
+        """Restart the timer that stops the stream when nobody is watching."""
+        if self._cancel_idle is not None:
+            self._cancel_idle()
+        self._cancel_idle = async_call_later(
+            self.hass, VIEWER_IDLE_TIMEOUT, self._async_handle_idle
+        )
+
+    async def _async_handle_idle(self, _now: datetime) -> None:
+        """Stop the stream after the last viewer went away."""
+        self._cancel_idle = None
+        _LOGGER.debug("No preview viewers on %s, stopping the stream", self._host)
+        await self._async_stop_stream()
+        self.async_write_ha_state()
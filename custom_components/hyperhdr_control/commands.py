@@ -0,0 +1,65 @@
+"""JSON API commands for HyperHDR Control integration."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from .const import CONTROL_PRIORITY
+
+ORIGIN = "Home Assistant"
+
+
+def component_key(component: str) -> str:
+    """Return the scheduler key of a component state command."""
+    return f"component:{component}"
+
+
+def component_command(component: str, state: bool) -> dict[str, Any]:
+    """Build the command enabling or disabling a component."""
+    return {
+        "command": "componentstate",
+        "componentstate": {
+            "component": component,
+            "state": state
+        }
+    }
+
+
+def brightness_command(brightness: float) -> dict[str, Any]:
+    """Build the adjustment command setting a brightness value."""
+    return {
+        "command": "adjustment",
+        "adjustment": {
+            "classic_config": False,
+            "brightness": int(brightness)
+        }
+    }
+
+
+def effect_command(name: str) -> dict[str, Any]:
+    """Build the command starting an effect."""
+    return {
+        "command": "effect",
+        "effect": {
+            "name": name
+        },
+        "duration": 0,
+        "priority": CONTROL_PRIORITY,
+        "origin": ORIGIN
+    }
+
+
+def color_command(color: Sequence[float]) -> dict[str, Any]:
+    """Build the command showing a solid color."""
+    return {
+        "command": "color",
+        "color": [round(channel) for channel in color],
+        "duration": 0,
+        "priority": CONTROL_PRIORITY,
+        "origin": ORIGIN
+    }
+
+
+def clear_command() -> dict[str, Any]:
+    """Build the command removing the color or effect set from Home Assistant."""
+    return {"command": "clear", "priority": CONTROL_PRIORITY}
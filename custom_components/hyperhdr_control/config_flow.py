@@ -1,16 +1,34 @@
 """Config flow for HyperHDR Control integration."""
 from __future__ import annotations
 
+import asyncio
+from typing import Any
+
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_PORT
-from homeassistant.core import HomeAssistant
-from homeassistant.data_entry_flow import FlowResult
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.data_entry_flow import FlowResult, FlowResultType
 from homeassistant.helpers import device_registry as dr
-import aiohttp
-import async_timeout
 
-from .const import DOMAIN, DEFAULT_PORT
+from .api import HyperHDRError
+from .const import (
+    DOMAIN,
+    CONF_AMBIENT_SAMPLE_RATE,
+    CONF_AMBIENT_SENSORS,
+    CONF_CAMERA_FPS,
+    CONF_FLATBUFFERS_PORT,
+    CONF_JSON_PORT,
+    CONF_OPTIMISTIC,
+    CONF_PERFORMANCE_STATS,
+    DEFAULT_AMBIENT_SAMPLE_RATE,
+    DEFAULT_CAMERA_FPS,
+    DEFAULT_FLATBUFFERS_PORT,
+    DEFAULT_JSON_PORT,
+    DEFAULT_PORT,
+    DEFAULT_SCAN_INTERVAL,
+)
+from .discovery import async_get_probe_cache
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for HyperHDR Control."""
@@ -23,6 +41,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._port: int | None = None
         self._name: str | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_zeroconf(self, discovery_info) -> FlowResult:
         """Handle zeroconf discovery."""
         self._host = discovery_info.host
@@ -33,9 +59,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         await self.async_set_unique_id(f"{self._host}:{self._port}")
         self._abort_if_unique_id_configured()
 
+        # Probe right away, so confirming only has to wait for the answer
+        async_get_probe_cache(self.hass).async_probe(self._host, self._port)
+
         # Set title for confirmation
         self.context["title_placeholders"] = {"name": self._name}
-        
+
         return await self.async_step_confirm()
 
     async def async_step_confirm(self, user_input=None) -> FlowResult:
@@ -55,7 +84,33 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(
         self, user_input: dict[str, any] | None = None
     ) -> FlowResult:
-        """Handle the initial step."""
+        """Offer to add every discovered server, or go to manual setup."""
+        if user_input is None and self._discovered_flows():
+            return self.async_show_menu(step_id="user", menu_options=["add_all", "manual"])
+        return await self.async_step_manual(user_input)
+
+    async def async_step_add_all(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Confirm every pending discovery at once; their probes run concurrently."""
+        flows = self._discovered_flows()
+        results = await asyncio.gather(
+            *(self.hass.config_entries.flow.async_configure(flow["flow_id"], {}) for flow in flows),
+            return_exceptions=True,
+        )
+        added = sum(
+            isinstance(result, dict) and result["type"] == FlowResultType.CREATE_ENTRY
+            for result in results
+        )
+        return self.async_abort(
+            reason="added_discovered",
+            description_placeholders={"added": str(added), "discovered": str(len(flows))},
+        )
+
+    async def async_step_manual(
+        self, user_input: dict[str, any] | None = None
+    ) -> FlowResult:
+        """Handle manual setup."""
         errors = {}
 
         if user_input is not None:
@@ -64,7 +119,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return await self._test_connection()
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_HOST): str,
@@ -74,28 +129,85 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    def _discovered_flows(self) -> list[dict[str, Any]]:
+        """Return the discoveries waiting for confirmation."""
+        return [
+            flow
+            for flow in self._async_in_progress(include_uninitialized=True)
+            if flow["context"].get("source") == config_entries.SOURCE_ZEROCONF
+            and flow["step_id"] == "confirm"
+        ]
+
     async def _test_connection(self) -> FlowResult:
-        """Test the connection to HyperHDR."""
+        """Test the connection to HyperHDR, reusing a running discovery probe."""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"https://{self._host}:{self._port}/json-rpc"
-                test_request = {
-                    "command": "serverinfo"
+            await async_get_probe_cache(self.hass).async_probe(self._host, self._port)
+        except HyperHDRError:
+            return self.async_abort(reason="cannot_connect")
+
+        await self.async_set_unique_id(
+            f"{self._host}:{self._port}", raise_on_progress=False
+        )
+        return self.async_create_entry(
+            title=self._name or f"HyperHDR ({self._host})",
+            data={
+                CONF_HOST: self._host,
+                CONF_PORT: self._port,
+            }
+        )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle HyperHDR Control options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_JSON_PORT,
+                        default=options.get(CONF_JSON_PORT, DEFAULT_JSON_PORT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=65535)),
+                    vol.Required(
+                        CONF_FLATBUFFERS_PORT,
+                        default=options.get(CONF_FLATBUFFERS_PORT, DEFAULT_FLATBUFFERS_PORT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=65535)),
+                    vol.Required(
+                        CONF_PERFORMANCE_STATS,
+                        default=options.get(CONF_PERFORMANCE_STATS, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_CAMERA_FPS,
+                        default=options.get(CONF_CAMERA_FPS, DEFAULT_CAMERA_FPS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=30)),
+                    vol.Required(
+                        CONF_AMBIENT_SENSORS,
+                        default=options.get(CONF_AMBIENT_SENSORS, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_AMBIENT_SAMPLE_RATE,
+                        default=options.get(CONF_AMBIENT_SAMPLE_RATE, DEFAULT_AMBIENT_SAMPLE_RATE),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=30)),
+                    vol.Required(
+                        CONF_OPTIMISTIC,
+                        default=options.get(CONF_OPTIMISTIC, True),
+                    ): bool,
                 }
-                async with async_timeout.timeout(10):
-                    async with session.get(url, params={"request": str(test_request)}) as response:
-                        if response.status == 200:
-                            await self.async_set_unique_id(
-                                f"{self._host}:{self._port}", raise_on_progress=False
-                            )
-                            return self.async_create_entry(
-                                title=self._name or f"HyperHDR ({self._host})",
-                                data={
-                                    CONF_HOST: self._host,
-                                    CONF_PORT: self._port,
-                                }
-                            )
-        except (aiohttp.ClientError, TimeoutError):
-            pass
-
-        return self.async_abort(reason="cannot_connect") 
+            ),
+        )
@@ -0,0 +1,410 @@
+"""Persistent JSON connection for HyperHDR requests and state subscriptions."""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import random
+import re
+from collections.abc import Callable
+import time
+from typing import TYPE_CHECKING, Any
+
+import async_timeout
+
+from .api import REQUEST_TIMEOUT, HyperHDRConnectionError, HyperHDRError, HyperHDRTimeoutError
+
+if TYPE_CHECKING:
+    from .stats import HyperHDRStats
+
+_LOGGER = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 10  # Seconds to wait for the TCP connection
+RECONNECT_MIN_DELAY = 1.0  # Seconds before the first reconnect attempt
+RECONNECT_MAX_DELAY = 60.0  # Upper bound for the reconnect backoff
+STREAM_LIMIT = 2**22  # serverinfo can exceed the default 64 KiB line limit
+
+SUBSCRIBE_TAN = 1  # tan of the subscription request, answered via on_message
+HOME_INSTANCE = 0  # Instance selected after connecting, whose state is pushed
+HOME_DELAY = 2.0  # Idle seconds before switching back to the home instance
+PEEK_BYTES = 128  # HyperHDR sorts keys, so "command" leads every message
+
+_COMMAND_RE = re.compile(rb'"command"\s*:\s*"([^"]+)"')
+
+SUBSCRIPTIONS = [
+    "components-update",
+    "adjustment-update",
+    "effects-update",
+    "priorities-update",
+]
+_SUBSCRIPTION_COMMANDS = frozenset(command.encode() for command in SUBSCRIPTIONS)
+
+
+class HyperHDRJsonConnection:
+    """Keep a subscription open on the HyperHDR JSON server.
+
+    HyperHDR answers newline-delimited JSON on its raw TCP JSON port. After
+    connecting, a ``serverinfo`` request with ``subscribe`` returns the full
+    state once and then streams incremental updates, which are handed to
+    ``on_message``. The connection is re-established with exponential backoff
+    and jitter whenever it drops.
+
+    Commands sent with ``request`` are pipelined on the same socket: each one
+    carries a unique ``tan`` and its response is matched back by that field,
+    so many commands can be in flight at once.
+
+    Streamed messages such as preview frames arrive many times per second;
+    lines of a command registered with ``add_stream_listener`` are handed over
+    as raw bytes without being parsed. An update identical to the previous one
+    of the same subscription is dropped before parsing as well.
+
+    A server can run several LED instances, and commands act on the instance
+    selected for the connection. Requests for the selected instance are
+    pipelined; requests for another one wait until those in flight are
+    answered and are then sent as one batch behind a single ``switchTo``.
+    Pushed messages are handed to ``on_message`` with the instance that was
+    selected when they arrived. After ``HOME_DELAY`` idle seconds the
+    connection switches back to the home instance.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        on_message: Callable[[int, dict[str, Any]], None],
+        on_connection_change: Callable[[bool], None],
+        on_instance_change: Callable[[int], None] | None = None,
+    ) -> None:
+        """Initialize the connection."""
+        self._host = host
+        self._port = port
+        self._on_message = on_message
+        self._on_connection_change = on_connection_change
+        self._on_instance_change = on_instance_change
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._connected = False
+        self._tans = itertools.count(SUBSCRIBE_TAN + 1)
+        self._pending: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        self._stream_listeners: dict[bytes, Callable[[bytes], None]] = {}
+        self._connection_listeners: list[Callable[[], None]] = []
+        self._last_updates: dict[bytes, bytes] = {}
+        self._instance = HOME_INSTANCE
+        self._in_flight = 0
+        self._waiting: dict[int, list[asyncio.Future[None]]] = {}
+        self._switching: asyncio.Task[None] | None = None
+        self._switch_tans: dict[int, int] = {}
+        self._home_timer: asyncio.TimerHandle | None = None
+        self.duplicate_updates = 0
+        self.instance_switches = 0
+        self.stats: HyperHDRStats | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the subscription is established."""
+        return self._connected
+
+    @property
+    def instance(self) -> int:
+        """Return the instance currently selected on the server."""
+        return self._instance
+
+    def add_connection_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener whenever the connection comes up or drops."""
+        self._connection_listeners.append(listener)
+        return lambda: self._connection_listeners.remove(listener)
+
+    def add_stream_listener(
+        self, command: str, listener: Callable[[bytes], None]
+    ) -> Callable[[], None]:
+        """Hand the raw lines of a streamed command to a listener."""
+        key = command.encode()
+        self._stream_listeners[key] = listener
+
+        def remove_listener() -> None:
+            if self._stream_listeners.get(key) is listener:
+                del self._stream_listeners[key]
+
+        return remove_listener
+
+    async def run(self) -> None:
+        """Connect and process messages until cancelled."""
+        attempt = 0
+        while True:
+            try:
+                await self._connect()
+                attempt = 0
+                await self._read_loop()
+            except (OSError, asyncio.IncompleteReadError, ValueError, TimeoutError) as error:
+                _LOGGER.debug("JSON connection to %s:%s failed: %s", self._host, self._port, error)
+            finally:
+                await self._close()
+                # Polling must resume however the connection ended
+                self._set_connected(False)
+
+            delay = min(RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY * 2**attempt)
+            attempt += 1
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    async def _connect(self) -> None:
+        """Open the socket and subscribe to state updates."""
+        async with async_timeout.timeout(CONNECT_TIMEOUT):
+            reader, writer = await asyncio.open_connection(
+                self._host, self._port, limit=STREAM_LIMIT
+            )
+        self._reader = reader
+        self._writer = writer
+        self._last_updates.clear()
+        self._switch_tans.clear()
+        self._instance = HOME_INSTANCE
+        await self._write(
+            {"command": "serverinfo", "subscribe": SUBSCRIPTIONS, "tan": SUBSCRIBE_TAN}
+        )
+        self._set_connected(True)
+        _LOGGER.debug("Subscribed to HyperHDR updates on %s:%s", self._host, self._port)
+
+    async def _read_loop(self) -> None:
+        """Dispatch incoming messages until the server closes the socket."""
+        while line := await self._reader.readline():
+            if match := _COMMAND_RE.search(line, 0, PEEK_BYTES):
+                command = match.group(1)
+                if (listener := self._stream_listeners.get(command)) is not None:
+                    try:
+                        listener(line)
+                    except Exception:
+                        _LOGGER.exception("Error handling %s from %s", command, self._host)
+                    continue
+                if command in _SUBSCRIPTION_COMMANDS:
+                    if self._last_updates.get(command) == line:
+                        self.duplicate_updates += 1
+                        continue
+                    self._last_updates[command] = line
+            try:
+                message = self._decode(line)
+            except ValueError:
+                _LOGGER.debug("Ignoring malformed message from %s: %s", self._host, line)
+                continue
+            if not isinstance(message, dict):
+                continue
+            tan = message.get("tan")
+            # Record a switch before reading on, so the pushes that follow
+            # are attributed to the new instance
+            if (instance := self._switch_tans.pop(tan, None)) is not None and message.get(
+                "success", True
+            ):
+                self._set_instance(instance)
+            future = self._pending.pop(tan, None)
+            if future is None:
+                # A late answer to a request that timed out may belong to
+                # an instance the connection has since left
+                if isinstance(tan, int) and tan > SUBSCRIBE_TAN:
+                    _LOGGER.debug("Dropping late response %s from %s", tan, self._host)
+                    continue
+                try:
+                    self._on_message(self._instance, message)
+                except Exception:
+                    _LOGGER.exception("Error handling a message from %s: %s", self._host, line)
+            elif not future.done():
+                future.set_result(message)
+
+    async def request(
+        self,
+        command: dict[str, Any],
+        timeout: float = REQUEST_TIMEOUT,
+        instance: int = HOME_INSTANCE,
+    ) -> dict[str, Any]:
+        """Send a command to an instance and wait for its response."""
+        if not self._connected:
+            raise HyperHDRConnectionError("JSON connection is not established")
+
+        try:
+            async with async_timeout.timeout(timeout):
+                await self._enter(instance)
+                try:
+                    response = await self._exchange(command)
+                finally:
+                    self._leave()
+        except TimeoutError as error:
+            raise HyperHDRTimeoutError(
+                f"No response to {command.get('command')} within {timeout}s"
+            ) from error
+        except OSError as error:
+            raise HyperHDRConnectionError(str(error)) from error
+
+        if not response.get("success", True):
+            raise HyperHDRError(response.get("error", "Command failed"))
+        return response
+
+    async def _exchange(
+        self, command: dict[str, Any], switch_to: int | None = None
+    ) -> dict[str, Any]:
+        """Send one command and wait for the response carrying the same tan."""
+        tan = next(self._tans)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[tan] = future
+        if switch_to is not None:
+            self._switch_tans[tan] = switch_to
+        try:
+            await self._write({**command, "tan": tan})
+            return await future
+        finally:
+            self._pending.pop(tan, None)
+
+    async def _enter(self, instance: int) -> None:
+        """Wait until commands for an instance may be sent."""
+        self._cancel_home()
+        if instance == self._instance and self._switching is None and not self._waiting:
+            self._in_flight += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(instance, []).append(future)
+        self._next_batch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Admitted just before the cancellation
+                self._leave()
+            elif future in (waiters := self._waiting.get(instance, [])):
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiting[instance]
+            raise
+
+    def _leave(self) -> None:
+        """Mark a command as answered and start the next batch once idle."""
+        self._in_flight -= 1
+        self._next_batch()
+
+    def _next_batch(self) -> None:
+        """Admit the oldest waiting batch once nothing is in flight."""
+        if self._in_flight or self._switching is not None:
+            return
+        if not self._waiting:
+            if self._instance != HOME_INSTANCE and self._home_timer is None and self._connected:
+                self._home_timer = asyncio.get_running_loop().call_later(
+                    HOME_DELAY, self._go_home
+                )
+            return
+
+        instance = next(iter(self._waiting))
+        if instance == self._instance:
+            self._admit(instance)
+        else:
+            self._switching = asyncio.get_running_loop().create_task(
+                self._switch(instance), name=f"hyperhdr {self._host} instance {instance}"
+            )
+
+    def _admit(self, instance: int) -> None:
+        """Let every waiting command for the selected instance through."""
+        for future in self._waiting.pop(instance, []):
+            if not future.done():
+                future.set_result(None)
+                self._in_flight += 1
+        if not self._in_flight:
+            self._next_batch()
+
+    async def _switch(self, instance: int) -> None:
+        """Select another instance, then admit the commands waiting for it."""
+        error: HyperHDRError | None = None
+        try:
+            async with async_timeout.timeout(REQUEST_TIMEOUT):
+                response = await self._exchange(
+                    {"command": "instance", "subcommand": "switchTo", "instance": instance},
+                    switch_to=instance,
+                )
+            if not response.get("success", True):
+                error = HyperHDRError(response.get("error", f"Cannot select instance {instance}"))
+        except TimeoutError:
+            error = HyperHDRTimeoutError(f"No response to selecting instance {instance}")
+        except OSError as err:
+            error = HyperHDRConnectionError(str(err))
+        except HyperHDRError as err:
+            error = err
+        finally:
+            self._switching = None
+
+        if error is None:
+            self._admit(instance)
+            return
+        _LOGGER.debug("Selecting instance %s on %s failed: %s", instance, self._host, error)
+        for future in self._waiting.pop(instance, []):
+            if not future.done():
+                future.set_exception(error)
+        self._next_batch()
+
+    def _go_home(self) -> None:
+        """Switch back to the home instance if the connection is still idle."""
+        self._home_timer = None
+        if (
+            self._connected
+            and self._instance != HOME_INSTANCE
+            and not self._in_flight
+            and not self._waiting
+            and self._switching is None
+        ):
+            self._switching = asyncio.get_running_loop().create_task(
+                self._switch(HOME_INSTANCE), name=f"hyperhdr {self._host} home instance"
+            )
+
+    def _cancel_home(self) -> None:
+        """Stop a pending switch back to the home instance."""
+        if self._home_timer is not None:
+            self._home_timer.cancel()
+            self._home_timer = None
+
+    def _set_instance(self, instance: int) -> None:
+        """Record the instance the server now applies commands and pushes to."""
+        self._instance = instance
+        self._last_updates.clear()
+        self.instance_switches += 1
+        if self._on_instance_change is not None:
+            self._on_instance_change(instance)
+
+    def _decode(self, line: bytes) -> Any:
+        """Parse one message, timing serverinfo payloads when stats are enabled."""
+        if self.stats is None:
+            return json.loads(line)
+
+        started = time.perf_counter()
+        message = json.loads(line)
+        if isinstance(message, dict) and message.get("command") == "serverinfo":
+            self.stats.record_serverinfo(len(line), time.perf_counter() - started)
+        return message
+
+    async def _write(self, request: dict[str, Any]) -> None:
+        """Send one request terminated by a newline."""
+        if self._writer is None:
+            raise ConnectionResetError("JSON connection closed")
+        self._writer.write(json.dumps(request, separators=(',', ':')).encode() + b"\n")
+        await self._writer.drain()
+
+    async def _close(self) -> None:
+        """Close the socket and fail the requests still waiting on it."""
+        self._fail_pending()
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    def _fail_pending(self) -> None:
+        """Fail every request still waiting for a response or an instance."""
+        self._cancel_home()
+        pending, self._pending = self._pending, {}
+        waiting, self._waiting = self._waiting, {}
+        for future in itertools.chain(pending.values(), *waiting.values()):
+            if not future.done():
+                future.set_exception(HyperHDRConnectionError("JSON connection lost"))
+
+    def _set_connected(self, connected: bool) -> None:
+        """Notify the owner when the connection state changes."""
+        if connected != self._connected:
+            self._connected = connected
+            self._on_connection_change(connected)
+            for listener in self._connection_listeners:
+                listener()
@@ -2,6 +2,27 @@
 
 DOMAIN = "hyperhdr_control"
 DEFAULT_PORT = 8090
+DEFAULT_JSON_PORT = 19444
+DEFAULT_FLATBUFFERS_PORT = 19400
+DEFAULT_SCAN_INTERVAL = 30  # Seconds between serverinfo polls
+DEFAULT_CAMERA_FPS = 5  # Preview frames per second kept from the image stream
+DEFAULT_AMBIENT_SAMPLE_RATE = 2  # LED frames per second sampled for ambient sensors
+
+CONTROL_PRIORITY = 64  # HyperHDR priority of the colors and effects set from Home Assistant
+STREAM_PRIORITY = 60  # HyperHDR priority of frames streamed over FlatBuffers
+
+DATA_TRANSITIONS = f"{DOMAIN}_transitions"
+DATA_PROBES = f"{DOMAIN}_probes"
+
+CONF_JSON_PORT = "json_port"
+CONF_FLATBUFFERS_PORT = "flatbuffers_port"
+CONF_PERFORMANCE_STATS = "performance_stats"
+CONF_CAMERA_FPS = "camera_fps"
+CONF_AMBIENT_SENSORS = "ambient_sensors"
+CONF_AMBIENT_SAMPLE_RATE = "ambient_sample_rate"
+CONF_OPTIMISTIC = "optimistic"
+
+EDGES = ("top", "bottom", "left", "right")  # Screen edges reported by the ambient sensors
 
 AVAILABLE_EFFECTS = [
     "Atomic Swirl",
@@ -0,0 +1,362 @@
+"""Data update coordinator for HyperHDR Control integration."""
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import timedelta
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api import HyperHDRClient, HyperHDRError
+from .const import AVAILABLE_EFFECTS, CONTROL_PRIORITY
+from .scheduler import PRIORITY_REFRESH, HyperHDRCommandScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10  # Seconds to batch snapshot writes
+
+
+class HyperHDRCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Fetch serverinfo once per interval and share it with every entity of a host.
+
+    While the JSON subscription is connected, state arrives as pushed updates
+    and polling is suspended; it resumes as soon as the subscription drops.
+
+    The last good state is saved to storage and restored on startup, so the
+    entities can be set up from it without waiting on the network.
+
+    When the client's circuit breaker opens, every entity of the host is
+    marked unavailable at once and a refresh is scheduled as the next probe.
+
+    The full serverinfo payload is loaded, but sections that no entity of
+    the host uses are not reduced: the LED layout is only kept when
+    ``parse_leds`` is set. Pushed updates that repeat the current state do
+    not notify the entities, unless one of them waits to check an optimistic
+    state against it.
+
+    Each LED instance of a server has its own coordinator. Pushed updates
+    follow the instance selected on the JSON connection, which is the first
+    one whenever the connection is idle, so only its coordinator suspends
+    polling while they flow. The other instances can only be reached over
+    the connection and are polled, and available, only while it is up.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: HyperHDRClient,
+        scheduler: HyperHDRCommandScheduler,
+        update_interval: timedelta,
+        storage_key: str,
+        parse_leds: bool = False,
+        instance: int = 0,
+        instance_name: str | None = None,
+        effects: list[str] | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"HyperHDR ({client.host})" + (f" instance {instance}" if instance else ""),
+            update_interval=None if instance else update_interval,
+        )
+        if instance:
+            self.last_update_success = False
+        self.client = client
+        self.instance = instance
+        self.instance_name = instance_name or f"Instance {instance}"
+        self._scheduler = scheduler
+        self._poll_interval = update_interval
+        self._fetching = False
+        self._leds_in_use = parse_leds
+        self.suppressed_writes = 0
+        # Counts fetches started and pushes received; data_sequence is the
+        # count at which the current data was requested
+        self.sequence = 0
+        self.data_sequence = 0
+        self.unconfirmed = 0  # Optimistic entity states waiting to be checked
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, storage_key)
+        self._effects: list[str] = list(effects or AVAILABLE_EFFECTS)
+        self._effects_hash = self._hash_effects(self._effects)
+        self._unsub_probe: Callable[[], None] | None = None
+        self._unsub_circuit: Callable[[], None] | None = client.circuit.add_listener(
+            self._async_circuit_changed
+        )
+
+    @property
+    def effects(self) -> list[str]:
+        """Return the names of the effects available on the server."""
+        return self._effects
+
+    @property
+    def effects_hash(self) -> str:
+        """Return a digest of the effect catalogue that changes with it."""
+        return self._effects_hash
+
+    async def async_load_snapshot(self) -> None:
+        """Restore the state saved by the last run without notifying listeners."""
+        if (cached := await self._store.async_load()) is None:
+            return
+        self.data = cached["data"]
+        self._update_effects(self.data)
+
+    @callback
+    def async_adopt_serverinfo(self, response: dict[str, Any]) -> None:
+        """Start from a serverinfo answer received elsewhere, without notifying listeners."""
+        self.data = self._parse_serverinfo(response)
+        self._process_data(self.data)
+
+    async def async_save_snapshot(self) -> None:
+        """Save the current state at once instead of after the batching delay."""
+        if self.data is not None:
+            await self._store.async_save({"data": self.data})
+
+    @callback
+    def async_set_updated_data(self, data: dict[str, Any]) -> None:
+        """Store data pushed by the subscription and notify listeners."""
+        self.sequence += 1
+        self.data_sequence = self.sequence
+        self._process_data(data)
+        super().async_set_updated_data(data)
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch serverinfo, skipping the cycle if a fetch is already in flight."""
+        if self._fetching:
+            _LOGGER.debug("Serverinfo fetch for %s still in flight, skipping cycle", self.client.host)
+            return self.data
+
+        self._fetching = True
+        self.sequence += 1
+        sequence = self.sequence
+        try:
+            data = self._parse_serverinfo(await self._fetch_serverinfo())
+        finally:
+            self._fetching = False
+
+        self.data_sequence = sequence
+        self._process_data(data)
+        return data
+
+    async def _fetch_serverinfo(self) -> dict[str, Any]:
+        """Request the serverinfo payload from HyperHDR, behind any user command."""
+        try:
+            data = await self._scheduler.submit(
+                "serverinfo", {"command": "serverinfo"}, PRIORITY_REFRESH
+            )
+        except HyperHDRError as error:
+            raise UpdateFailed(f"Error fetching serverinfo: {error}") from error
+
+        _LOGGER.debug("Received serverinfo response: %s", data)
+        return data
+
+    async def async_shutdown(self) -> None:
+        """Cancel the pending probe and stop following the circuit breaker."""
+        await super().async_shutdown()
+        if self._unsub_circuit is not None:
+            self._unsub_circuit()
+            self._unsub_circuit = None
+        if self._unsub_probe is not None:
+            self._unsub_probe()
+            self._unsub_probe = None
+
+    @callback
+    def _async_circuit_changed(self) -> None:
+        """Mark the host unavailable while its circuit is open and probe it."""
+        if self._unsub_probe is not None:
+            self._unsub_probe()
+            self._unsub_probe = None
+
+        if not self.client.circuit.is_open:
+            _LOGGER.info("HyperHDR at %s is reachable again", self.client.host)
+            return
+
+        _LOGGER.warning(
+            "HyperHDR at %s is unreachable, retrying in %.0f seconds",
+            self.client.host,
+            self.client.circuit.retry_in,
+        )
+        self._unsub_probe = async_call_later(
+            self.hass, self.client.circuit.retry_in, self._async_probe
+        )
+        if self.last_update_success:
+            self.last_update_success = False
+            self.async_update_listeners()
+
+    async def _async_probe(self, _now: Any) -> None:
+        """Probe an open circuit with a serverinfo refresh."""
+        self._unsub_probe = None
+        await self.async_refresh()
+
+    @callback
+    def async_set_push_connected(self, connected: bool) -> None:
+        """Suspend polling while push updates flow, resume it when they stop."""
+        if self.instance:
+            # Updates of other instances are only pushed while they are
+            # selected, so they are polled whenever they can be reached
+            if connected:
+                self.update_interval = self._poll_interval
+                self.hass.async_create_task(self.async_request_refresh())
+                return
+            self.update_interval = None
+            self._unschedule_refresh()
+            if self.last_update_success:
+                self.last_update_success = False
+                self.async_update_listeners()
+            return
+
+        if connected:
+            _LOGGER.debug("Push updates active for %s, polling suspended", self.client.host)
+            self.client.circuit.record_success()
+            self.update_interval = None
+            return
+
+        _LOGGER.debug("Push updates lost for %s, polling resumed", self.client.host)
+        self.update_interval = self._poll_interval
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_handle_push(self, message: dict[str, Any]) -> None:
+        """Apply a message received on the JSON subscription."""
+        command = message.get("command")
+
+        if command == "serverinfo":
+            if message.get("success", True) and "info" in message:
+                self.async_set_updated_data(self._parse_serverinfo(message))
+            return
+
+        if self.data is None:
+            return
+
+        if command == "components-update":
+            component = message.get("data")
+            if not isinstance(component, dict):
+                return
+            section = "components"
+            value: Any = {
+                **self.data["components"],
+                component.get("name"): component.get("enabled", False),
+            }
+        elif command == "adjustment-update":
+            section = "brightness"
+            if (value := self._parse_brightness(message.get("data", []))) is None:
+                return
+        elif command == "priorities-update":
+            data = message.get("data")
+            if not isinstance(data, dict):
+                return
+            # No color of ours in the priorities means it was cleared
+            section = "color"
+            value = self._parse_color(data.get("priorities"))
+        elif command == "effects-update":
+            section = "effects"
+            if (value := self._parse_effects(message.get("data"))) is None:
+                return
+        else:
+            return
+
+        if value == self.data.get(section) and not self.unconfirmed:
+            # The push repeats the current state and no entity waits to check it
+            return
+        self.async_set_updated_data({**self.data, section: value})
+
+    def _process_data(self, data: dict[str, Any]) -> None:
+        """Adopt new data and schedule it to be saved as the latest snapshot."""
+        self._update_effects(data)
+        self._store.async_delay_save(lambda: {"data": self.data}, STORAGE_SAVE_DELAY)
+
+    def _update_effects(self, data: dict[str, Any]) -> None:
+        """Adopt the effect catalogue of new data if it changed."""
+        effects = data.get("effects")
+        if effects is None:
+            return
+        effects_hash = self._hash_effects(effects)
+        if effects_hash == self._effects_hash:
+            return
+
+        _LOGGER.debug("Effect catalogue of %s changed", self.client.host)
+        self._effects = effects
+        self._effects_hash = effects_hash
+
+    @staticmethod
+    def _hash_effects(effects: list[str]) -> str:
+        """Return a stable digest of a list of effect names."""
+        return hashlib.sha1("\n".join(effects).encode()).hexdigest()
+
+    @staticmethod
+    def _parse_effects(effects: Any) -> list[str] | None:
+        """Take the effect names from a serverinfo effects section."""
+        if not isinstance(effects, list):
+            return None
+        return [effect["name"] for effect in effects if "name" in effect]
+
+    @staticmethod
+    def _parse_brightness(adjustments: Any) -> float | None:
+        """Take the first adjustment's brightness value."""
+        if isinstance(adjustments, list) and adjustments:
+            return float(adjustments[0].get("brightness", 100))
+        return None
+
+    @staticmethod
+    def _parse_color(priorities: Any) -> list[int] | None:
+        """Take the color set from Home Assistant out of the priority list."""
+        if not isinstance(priorities, list):
+            return None
+        for priority in priorities:
+            if priority.get("priority") == CONTROL_PRIORITY and priority.get("componentId") == "COLOR":
+                return priority.get("value", {}).get("RGB")
+        return None
+
+    @staticmethod
+    def _parse_instances(instances: Any) -> list[dict[str, Any]]:
+        """Take the running LED instances from a serverinfo instance section."""
+        if not isinstance(instances, list):
+            return [{"instance": 0, "name": None}]
+        return [
+            {"instance": instance["instance"], "name": instance.get("friendly_name")}
+            for instance in instances
+            if "instance" in instance and instance.get("running", True)
+        ]
+
+    @staticmethod
+    def _parse_version(info: dict[str, Any]) -> str | None:
+        """Take the server version from serverinfo, where the server reports it."""
+        for section in ("hyperhdr", "hyperion"):
+            details = info.get(section)
+            if isinstance(details, dict) and isinstance(details.get("version"), str):
+                return details["version"]
+        return None
+
+    @staticmethod
+    def _parse_leds(leds: Any) -> list[list[float]] | None:
+        """Take the screen area of every LED from a serverinfo leds section."""
+        if not isinstance(leds, list):
+            return None
+        return [
+            [led.get("hmin", 0.0), led.get("hmax", 0.0), led.get("vmin", 0.0), led.get("vmax", 0.0)]
+            for led in leds
+        ]
+
+    def _parse_serverinfo(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Reduce a serverinfo payload to the state the entities need."""
+        info = data.get("info", {})
+
+        components = {
+            component.get("name"): component.get("enabled", False)
+            for component in info.get("components", [])
+        }
+
+        return {
+            "components": components,
+            "brightness": self._parse_brightness(info.get("adjustment", [])),
+            "effects": self._parse_effects(info.get("effects")),
+            "leds": self._parse_leds(info.get("leds")) if self._leds_in_use else None,
+            "color": self._parse_color(info.get("priorities")),
+            "instances": self._parse_instances(info.get("instance")),
+            "version": self._parse_version(info),
+        }
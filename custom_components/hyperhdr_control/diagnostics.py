@@ -0,0 +1,67 @@
+"""Diagnostics support for HyperHDR Control integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_HOST, "host", "title", "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    client = data["client"]
+    coordinator = data["coordinator"]
+    scheduler = data["scheduler"]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "push_connected": data["connection"].connected,
+            "suppressed_writes": coordinator.suppressed_writes,
+            "duplicate_updates": data["connection"].duplicate_updates,
+            "selected_instance": data["connection"].instance,
+            "instance_switches": data["connection"].instance_switches,
+            "data": coordinator.data,
+        },
+        "instances": {
+            instance: {
+                "name": runtime["coordinator"].instance_name,
+                "last_update_success": runtime["coordinator"].last_update_success,
+                "queue_depth": runtime["scheduler"].queue_depth,
+                "data": runtime["coordinator"].data if instance else None,
+            }
+            for instance, runtime in data["instances"].items()
+        },
+        "circuit": {
+            "open": client.circuit.is_open,
+            "retry_in": client.circuit.retry_in,
+        },
+        "scheduler": {
+            "rtt_ms": scheduler.rtt * 1000 if scheduler.rtt is not None else None,
+            "queue_depth": scheduler.queue_depth,
+            "totals": scheduler.stats,
+            "brightness": scheduler.key_stats("brightness"),
+        },
+        "stats": client.stats.as_dict() if client.stats is not None else None,
+        "stream": {
+            "connected": data["stream"].connected,
+            "frames_sent": data["stream"].frames_sent,
+            "frames_dropped": data["stream"].frames_dropped,
+        },
+        "ambient": data["analytics"].reading if data["analytics"] is not None else None,
+    }
@@ -0,0 +1,95 @@
+"""Discovery probing for HyperHDR Control integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import async_timeout
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import HyperHDRClient, HyperHDRError, HyperHDRTimeoutError
+from .const import DATA_PROBES
+
+_LOGGER = logging.getLogger(__name__)
+
+PROBE_TIMEOUT = 3  # Seconds a discovered server has to answer serverinfo
+PROBE_CACHE_TTL = 300  # Seconds a successful probe is reused by setup
+MAX_CONCURRENT_PROBES = 16  # Servers probed at the same time
+
+
+class HyperHDRProbeCache:
+    """Probe discovered HyperHDR servers concurrently and remember the answers.
+
+    A probe requests ``serverinfo`` over Home Assistant's shared HTTP session
+    with a short timeout. Asking for a server that is already being probed
+    joins the running probe, so a discovery and its confirmation share one
+    request. A successful answer is kept for ``PROBE_CACHE_TTL`` seconds and
+    handed to setup once, which then starts from it instead of the network.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._probes: dict[str, tuple[float, asyncio.Task[dict[str, Any]]]] = {}
+        self._limit = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+
+    @callback
+    def async_probe(self, host: str, port: int) -> asyncio.Task[dict[str, Any]]:
+        """Return the probe of a server, starting it unless one is running or fresh."""
+        key = f"{host}:{port}"
+        if (probe := self._probes.get(key)) is not None:
+            started, task = probe
+            failed = task.done() and (task.cancelled() or task.exception() is not None)
+            if not failed and time.monotonic() - started < PROBE_CACHE_TTL:
+                return task
+
+        task = self._hass.async_create_background_task(
+            self._async_serverinfo(host, port), f"hyperhdr probe {key}"
+        )
+        self._probes[key] = (time.monotonic(), task)
+        return task
+
+    @callback
+    def async_pop(self, host: str, port: int) -> dict[str, Any] | None:
+        """Return and forget the serverinfo of a recent successful probe."""
+        if (probe := self._probes.pop(f"{host}:{port}", None)) is None:
+            return None
+        started, task = probe
+        if (
+            not task.done()
+            or task.cancelled()
+            or task.exception() is not None
+            or time.monotonic() - started >= PROBE_CACHE_TTL
+        ):
+            return None
+        return task.result()
+
+    async def _async_serverinfo(self, host: str, port: int) -> dict[str, Any]:
+        """Request serverinfo from one server."""
+        client = HyperHDRClient(host, port, async_get_clientsession(self._hass))
+        async with self._limit:
+            try:
+                async with async_timeout.timeout(PROBE_TIMEOUT):
+                    response = await client.send({"command": "serverinfo"})
+            except TimeoutError as error:
+                raise HyperHDRTimeoutError(
+                    f"No answer from {host}:{port} within {PROBE_TIMEOUT}s"
+                ) from error
+            except HyperHDRError as error:
+                _LOGGER.debug("Probing %s:%s failed: %s", host, port, error)
+                raise
+        if "info" not in response:
+            raise HyperHDRError(f"{host}:{port} did not answer serverinfo")
+        return response
+
+
+@callback
+def async_get_probe_cache(hass: HomeAssistant) -> HyperHDRProbeCache:
+    """Return the probe cache shared by all config flows and entries."""
+    if (cache := hass.data.get(DATA_PROBES)) is None:
+        cache = hass.data[DATA_PROBES] = HyperHDRProbeCache(hass)
+    return cache
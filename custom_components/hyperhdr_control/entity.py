@@ -0,0 +1,197 @@
+"""Base entity for HyperHDR Control integration."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .api import HyperHDRError
+from .const import DOMAIN
+from .coordinator import HyperHDRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def instance_id(host: str, port: int, instance: int) -> str:
+    """Return the part of unique IDs naming a host and LED instance.
+
+    The first instance keeps the IDs used before instances were supported.
+    """
+    if not instance:
+        return f"{host}_{port}"
+    return f"{host}_{port}_instance{instance}"
+
+
+def instance_device_info(
+    host: str, port: int, instance: int = 0, name: str | None = None, version: str | None = None
+) -> DeviceInfo:
+    """Return the device of a host's LED instance."""
+    if not instance:
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"{host}:{port}")},
+            manufacturer="HyperHDR",
+            name=f"HyperHDR ({host})",
+            model="HyperHDR LED Controller",
+            sw_version=version,
+        )
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"{host}:{port}:{instance}")},
+        manufacturer="HyperHDR",
+        name=f"HyperHDR ({host}) {name}",
+        model="HyperHDR LED Instance",
+        sw_version=version,
+        via_device=(DOMAIN, f"{host}:{port}"),
+    )
+
+
+class HyperHDRInstanceInfo:
+    """Identity of one LED instance, shared by all of its entities.
+
+    Built once per instance at setup, so entities reference one device
+    description and one unique-ID part instead of each building their own.
+    """
+
+    __slots__ = ("entry_id", "host", "port", "instance", "name", "unique_id", "device_info")
+
+    def __init__(
+        self,
+        entry_id: str,
+        host: str,
+        port: int,
+        instance: int = 0,
+        name: str | None = None,
+        version: str | None = None,
+    ) -> None:
+        """Initialize the instance info."""
+        self.entry_id = entry_id
+        self.host = host
+        self.port = port
+        self.instance = instance
+        self.name = name
+        self.unique_id = instance_id(host, port, instance)
+        self.device_info = instance_device_info(host, port, instance, name, version)
+
+    def entity_name(self, name: str) -> str:
+        """Return an entity name, prefixed with the instance name past the first."""
+        if not self.instance:
+            return f"HyperHDR {name}"
+        return f"HyperHDR {self.name} {name}"
+
+
+class HyperHDRCoordinatorEntity(CoordinatorEntity[HyperHDRCoordinator]):
+    """Coordinator entity of one LED instance that only writes changed state.
+
+    Subclasses take their values from the coordinator in
+    ``_update_from_coordinator`` and return what they publish from
+    ``_published_state``. A coordinator update that leaves the published
+    values and the availability as they were last written is counted on the
+    coordinator instead of being written to the state machine.
+
+    When the host is optimistic, a command's state is written before it is
+    sent and ``_async_confirm`` waits for the answer in the background. A
+    failed command rolls the state back to the coordinator's data unless a
+    newer one replaced it. Coordinator updates are held back while commands
+    are unconfirmed and replayed once the last one is answered. Data
+    requested before the last command was sent cannot confirm it and is not
+    adopted; the first newer update wins, and a value it disagrees with is
+    logged.
+    """
+
+    _written: tuple[Any, ...] | None = None
+    _confirming = 0
+    _held_update = False
+    _generation = 0
+    _expected: tuple[Any, ...] | None = None
+    _sent_sequence = 0
+
+    def __init__(self, coordinator: HyperHDRCoordinator, info: HyperHDRInstanceInfo) -> None:
+        """Initialize the entity of an LED instance."""
+        super().__init__(coordinator)
+        self._info = info
+        self._attr_device_info = info.device_info
+
+    def _published_state(self) -> tuple[Any, ...]:
+        """Return the values that make up the entity's state."""
+        return ()
+
+    @callback
+    def _async_confirm(self, command: Awaitable[dict[str, Any] | None]) -> None:
+        """Write the optimistic state and confirm its command in the background."""
+        self._generation += 1
+        self._confirming += 1
+        self._set_expected(self._published_state())
+        self._sent_sequence = self.coordinator.sequence
+        self.async_write_ha_state()
+        self.hass.async_create_background_task(
+            self._async_await_confirmation(command, self._generation),
+            f"hyperhdr confirm {self.entity_id}",
+        )
+
+    async def _async_await_confirmation(
+        self, command: Awaitable[dict[str, Any] | None], generation: int
+    ) -> None:
+        """Roll the state back if the command fails and nothing newer was set."""
+        try:
+            await command
+        except HyperHDRError as error:
+            if generation == self._generation:
+                _LOGGER.warning("%s could not be set, rolling back: %s", self.entity_id, error)
+                self._update_from_coordinator()
+                self._set_expected(None)
+                self.async_write_ha_state()
+        finally:
+            self._confirming -= 1
+
+        # The update for a command often arrives with its answer; check the
+        # state against one that was held back meanwhile
+        if not self._confirming and self._held_update:
+            self._held_update = False
+            self._handle_coordinator_update()
+
+    def _update_from_coordinator(self) -> None:
+        """Take the entity's values from the latest coordinator data."""
+
+    def _set_expected(self, expected: tuple[Any, ...] | None) -> None:
+        """Set the state awaiting a check and count it on the coordinator."""
+        if (self._expected is None) != (expected is None):
+            self.coordinator.unconfirmed += 1 if expected is not None else -1
+        self._expected = expected
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop waiting to check an optimistic state."""
+        self._set_expected(None)
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember what was written."""
+        self._written = (self.available, *self._published_state())
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the update changed it."""
+        if self._confirming:
+            self._held_update = True
+        elif self._expected is not None and self.coordinator.data_sequence <= self._sent_sequence:
+            # Requested before the last command was sent, so it predates it
+            pass
+        else:
+            self._update_from_coordinator()
+            if self._expected is not None:
+                if (published := self._published_state()) != self._expected:
+                    _LOGGER.warning(
+                        "HyperHDR reports %s for %s instead of %s that was set",
+                        published,
+                        self.entity_id,
+                        self._expected,
+                    )
+                self._set_expected(None)
+        if (self.available, *self._published_state()) == self._written:
+            self.coordinator.suppressed_writes += 1
+            return
+        super()._handle_coordinator_update()
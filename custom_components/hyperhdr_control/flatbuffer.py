@@ -0,0 +1,259 @@
+"""FlatBuffers input stream for HyperHDR Control integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import struct
+from collections.abc import Sequence
+
+import async_timeout
+
+_LOGGER = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 10  # Seconds to wait for the TCP connection
+RECONNECT_MIN_DELAY = 1.0  # Seconds before the first reconnect attempt
+RECONNECT_MAX_DELAY = 60.0  # Upper bound for the reconnect backoff
+MAX_REPLY_SIZE = 2**16  # Replies are tiny; anything larger is a protocol error
+
+# Union member ids of Request.command in the hyperionnet schema
+_COMMAND_COLOR = 1
+_COMMAND_IMAGE = 2
+_COMMAND_CLEAR = 3
+_COMMAND_REGISTER = 4
+_IMAGE_TYPE_RAW = 1
+
+# Every message starts with the same 24 bytes: the root offset, the Request
+# vtable and the Request table holding the command type and the offset of the
+# command table. The command's vtable follows at byte 24.
+_SIZE = struct.Struct(">I")
+_REQUEST = struct.Struct("<I HHHH iB3xI")
+_COMMAND_TABLE = 32  # Position of the command table unless it has three fields
+
+
+def _request(command_type: int, command_table: int = _COMMAND_TABLE) -> bytes:
+    """Encode the root offset and the Request table of a message."""
+    return _REQUEST.pack(12, 8, 12, 4, 8, 8, command_type, command_table - 20)
+
+
+def _prefixed(message: bytes | bytearray) -> bytearray:
+    """Prepend the big-endian size prefix HyperHDR expects."""
+    return bytearray(_SIZE.pack(len(message)) + message)
+
+
+def encode_register(origin: str, priority: int) -> bytearray:
+    """Encode a Register request for an origin and priority."""
+    name = origin.encode()
+    padding = -(len(name) + 1) % 4
+    return _prefixed(
+        _request(_COMMAND_REGISTER)
+        # Register vtable at 24, table at 32 with the origin string at 44
+        + struct.pack("<HHHH iIi", 8, 12, 4, 8, 8, 44 - 36, priority)
+        + struct.pack("<I", len(name))
+        + name
+        + bytes(1 + padding)
+    )
+
+
+def encode_clear(priority: int) -> bytearray:
+    """Encode a Clear request for a priority."""
+    return _prefixed(
+        _request(_COMMAND_CLEAR)
+        # Clear vtable at 24 (padded to 8 bytes), table at 32
+        + struct.pack("<HHH2x ii", 6, 8, 4, 8, priority)
+    )
+
+
+class _ColorFrame:
+    """Preallocated Color request whose color is patched in place."""
+
+    __slots__ = ("buffer",)
+
+    # Byte offset of Color.data, including the size prefix
+    _DATA = 4 + _COMMAND_TABLE + 4
+
+    def __init__(self) -> None:
+        """Encode the frame once."""
+        self.buffer = _prefixed(
+            _request(_COMMAND_COLOR)
+            # Color vtable at 24, table at 32: data, then duration -1 (endless)
+            + struct.pack("<HHHH iii", 8, 12, 4, 8, 8, 0, -1)
+        )
+
+    def set(self, red: int, green: int, blue: int) -> bytearray:
+        """Write a color into the frame and return it."""
+        struct.pack_into("<i", self.buffer, self._DATA, (red << 16) | (green << 8) | blue)
+        return self.buffer
+
+
+class _ImageFrame:
+    """Preallocated Image request for one image size, filled in place."""
+
+    __slots__ = ("buffer", "width", "height", "_pixels")
+
+    # Image table at 36 and RawImage table at 64, vtables in front of each
+    _IMAGE_TABLE = 36
+    _RAW_TABLE = 64
+    _VECTOR = 80
+
+    def __init__(self, width: int, height: int) -> None:
+        """Encode the frame once for a width and height."""
+        size = width * height * 3
+        message = bytearray(
+            _request(_COMMAND_IMAGE, self._IMAGE_TABLE)
+            + struct.pack("<HHHHH2x", 10, 16, 4, 8, 12)
+            + struct.pack("<iB3xIi", 12, _IMAGE_TYPE_RAW, self._RAW_TABLE - 44, -1)
+            + struct.pack("<HHHHH2x", 10, 16, 4, 8, 12)
+            + struct.pack("<iIii", 12, self._VECTOR - 68, width, height)
+            + struct.pack("<I", size)
+        )
+        message += bytes(size + (-size % 4))
+        self.buffer = _prefixed(message)
+        self.width = width
+        self.height = height
+        start = 4 + self._VECTOR + 4
+        self._pixels = memoryview(self.buffer)[start : start + size]
+
+    def set(self, pixels: bytes | bytearray | memoryview) -> bytearray:
+        """Copy RGB pixels into the frame and return it."""
+        self._pixels[:] = pixels
+        return self.buffer
+
+
+def _reply_error(reply: bytes) -> str | None:
+    """Return the error string of a Reply message, if it carries one."""
+    try:
+        (table,) = struct.unpack_from("<I", reply, 0)
+        (vtable_offset,) = struct.unpack_from("<i", reply, table)
+        vtable = table - vtable_offset
+        vtable_size, _ = struct.unpack_from("<HH", reply, vtable)
+        if vtable_size < 6:
+            return None
+        (field,) = struct.unpack_from("<H", reply, vtable + 4)
+        if not field:
+            return None
+        (string_offset,) = struct.unpack_from("<I", reply, table + field)
+        string = table + field + string_offset
+        (length,) = struct.unpack_from("<I", reply, string)
+        return reply[string + 4 : string + 4 + length].decode(errors="replace")
+    except struct.error:
+        return None
+
+
+class HyperHDRFlatBufferSender:
+    """Stream colors and images to the HyperHDR FlatBuffers server.
+
+    The connection is opened on the first frame and kept open, reconnecting
+    with backoff when it drops. Frames are encoded into buffers allocated
+    once, and a frame is only written when the previous ones have left the
+    process: while the socket is backed up, new frames are dropped instead
+    of queued, so a slow host always shows the latest frame that got
+    through rather than falling further behind.
+    """
+
+    def __init__(self, host: str, port: int, origin: str, priority: int) -> None:
+        """Initialize the sender."""
+        self._host = host
+        self._port = port
+        self._origin = origin
+        self._priority = priority
+        self._writer: asyncio.StreamWriter | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._color = _ColorFrame()
+        self._image: _ImageFrame | None = None
+        self.frames_sent = 0
+        self.frames_dropped = 0
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the connection is registered."""
+        return self._writer is not None
+
+    def send_color(self, color: Sequence[int]) -> bool:
+        """Send a solid color; returns False if the frame was dropped."""
+        if not self._writable():
+            return False
+        red, green, blue = (max(0, min(255, int(channel))) for channel in color)
+        return self._write(self._color.set(red, green, blue))
+
+    def send_image(self, width: int, height: int, pixels: bytes | bytearray | memoryview) -> bool:
+        """Send an RGB image; returns False if the frame was dropped."""
+        if len(pixels) != width * height * 3:
+            raise ValueError(f"Expected {width * height * 3} bytes of RGB data, got {len(pixels)}")
+        if not self._writable():
+            return False
+        if self._image is None or (self._image.width, self._image.height) != (width, height):
+            self._image = _ImageFrame(width, height)
+        return self._write(self._image.set(pixels))
+
+    def clear(self) -> bool:
+        """Remove the color or image shown at this sender's priority."""
+        if self._writer is None or self._writer.is_closing():
+            return False
+        self._writer.write(encode_clear(self._priority))
+        return True
+
+    async def async_close(self) -> None:
+        """Clear the priority and close the connection."""
+        self.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _writable(self) -> bool:
+        """Return True if a frame can be written now, connecting if needed."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name=f"hyperhdr {self._host} flatbuffers"
+            )
+        writer = self._writer
+        # Frames are patched in place, so nothing of the previous one may
+        # still be waiting in the transport
+        if writer is None or writer.is_closing() or writer.transport.get_write_buffer_size():
+            self.frames_dropped += 1
+            return False
+        return True
+
+    def _write(self, frame: bytearray) -> bool:
+        """Write one encoded frame."""
+        self._writer.write(frame)
+        self.frames_sent += 1
+        return True
+
+    async def _run(self) -> None:
+        """Keep the connection open and consume replies until cancelled."""
+        attempt = 0
+        while True:
+            try:
+                async with async_timeout.timeout(CONNECT_TIMEOUT):
+                    reader, writer = await asyncio.open_connection(self._host, self._port)
+                writer.write(encode_register(self._origin, self._priority))
+                self._writer = writer
+                attempt = 0
+                _LOGGER.debug("FlatBuffers stream to %s:%s open", self._host, self._port)
+                await self._read_replies(reader)
+            except (OSError, asyncio.IncompleteReadError, ValueError, TimeoutError) as error:
+                _LOGGER.debug(
+                    "FlatBuffers connection to %s:%s failed: %s", self._host, self._port, error
+                )
+            finally:
+                writer, self._writer = self._writer, None
+                if writer is not None:
+                    writer.close()
+
+            delay = min(RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY * 2**attempt)
+            attempt += 1
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    async def _read_replies(self, reader: asyncio.StreamReader) -> None:
+        """Read size-prefixed replies, logging the errors they report."""
+        while True:
+            (size,) = _SIZE.unpack(await reader.readexactly(_SIZE.size))
+            if size > MAX_REPLY_SIZE:
+                raise ValueError(f"Reply of {size} bytes")
+            if (error := _reply_error(await reader.readexactly(size))) is not None:
+                _LOGGER.warning("HyperHDR at %s rejected a frame: %s", self._host, error)
@@ -0,0 +1,211 @@
+"""Light platform for HyperHDR Control integration."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_RGB_COLOR,
+    ATTR_TRANSITION,
+    ColorMode,
+    LightEntity,
+    LightEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .api import HyperHDRError
+from .commands import clear_command, color_command
+from .const import CONF_OPTIMISTIC, DOMAIN
+from .coordinator import HyperHDRCoordinator
+from .entity import HyperHDRCoordinatorEntity, HyperHDRInstanceInfo
+from .scheduler import HyperHDRCommandScheduler
+from .transitions import async_get_transition_manager, frame_interval
+
+_LOGGER = logging.getLogger(__name__)
+
+BLACK = (0.0, 0.0, 0.0)
+
+
+def _split_color(
+    color: tuple[float, ...] | None,
+) -> tuple[tuple[int, int, int] | None, int | None]:
+    """Split a device color into a full-brightness RGB color and a brightness."""
+    if color is None:
+        return None, None
+    brightness = max(color)
+    if not brightness:
+        return None, 0
+    red, green, blue = (round(channel * 255 / brightness) for channel in color)
+    return (red, green, blue), round(brightness)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the HyperHDR Control light."""
+    optimistic = entry.options.get(CONF_OPTIMISTIC, True)
+    async_add_entities([
+        HyperHDRColorLight(runtime["coordinator"], runtime["scheduler"], runtime["info"], optimistic)
+        for runtime in hass.data[DOMAIN][entry.entry_id]["instances"].values()
+    ])
+
+
+class HyperHDRColorLight(HyperHDRCoordinatorEntity, LightEntity):
+    """Solid color shown by HyperHDR, set with its ``color`` command.
+
+    The color is set on the same priority as the effect buttons, so it
+    replaces a running effect and turning the light off clears both.
+    Transitions are computed here and sent as paced frames.
+    """
+
+    _attr_color_mode = ColorMode.RGB
+    _attr_supported_color_modes = {ColorMode.RGB}
+    _attr_supported_features = LightEntityFeature.TRANSITION
+
+    def __init__(
+        self,
+        coordinator: HyperHDRCoordinator,
+        scheduler: HyperHDRCommandScheduler,
+        info: HyperHDRInstanceInfo,
+        optimistic: bool = True,
+    ) -> None:
+        """Initialize the light."""
+        super().__init__(coordinator, info)
+        self._scheduler = scheduler
+        self._optimistic = optimistic
+        self._attr_name = info.entity_name("Color")
+        self._attr_unique_id = f"hyperhdr_color_{info.unique_id}"
+        self._transition_key = f"{info.entry_id}:{info.instance}:color"
+        self._color: tuple[float, float, float] | None = None
+        self._target: tuple[float, ...] | None = None
+        self._update_from_coordinator()
+
+    @property
+    def is_on(self) -> bool:
+        """Return True while a color is set from Home Assistant."""
+        return self._color is not None
+
+    @property
+    def brightness(self) -> int | None:
+        """Return the brightness, taken from the strongest channel of the color."""
+        return _split_color(self._color)[1]
+
+    @property
+    def rgb_color(self) -> tuple[int, int, int] | None:
+        """Return the color scaled to full brightness."""
+        return _split_color(self._color)[0]
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Set a color, fading to it if a transition is given."""
+        # Unchanged attributes are kept from the target of a running transition
+        current_rgb, current_brightness = _split_color(
+            self._target if self._target is not None else self._color
+        )
+        rgb_color = kwargs.get(ATTR_RGB_COLOR, current_rgb or (255, 255, 255))
+        brightness = kwargs.get(ATTR_BRIGHTNESS, current_brightness or 255)
+        target = tuple(channel * brightness / 255 for channel in rgb_color)
+        await self._async_fade(target, kwargs.get(ATTR_TRANSITION))
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Clear the color, fading to black first if a transition is given."""
+        if kwargs.get(ATTR_TRANSITION) and self._color is not None:
+            await self._async_fade(BLACK, kwargs[ATTR_TRANSITION], self._clear)
+            return
+        self._target = None
+        async_get_transition_manager(self.hass).async_cancel(self._transition_key)
+        if self._optimistic:
+            self._async_send_optimistic(clear_command(), None)
+            return
+        await self._clear()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop a running transition."""
+        async_get_transition_manager(self.hass).async_cancel(self._transition_key)
+        await super().async_will_remove_from_hass()
+
+    async def _async_fade(
+        self,
+        target: tuple[float, ...],
+        transition: float | None,
+        on_complete: Callable[[], Awaitable[Any]] | None = None,
+    ) -> None:
+        """Send a color at once or start a transition to it."""
+        manager = async_get_transition_manager(self.hass)
+        if not transition:
+            self._target = None
+            manager.async_cancel(self._transition_key)
+            if self._optimistic:
+                request_data = color_command(target)
+                self._async_send_optimistic(request_data, tuple(request_data["color"]))
+                return
+            try:
+                await self._send_color(target)
+            except HyperHDRError as error:
+                _LOGGER.error("Error setting color: %s", error)
+            return
+
+        async def complete() -> None:
+            self._target = None
+            if on_complete is not None:
+                await on_complete()
+
+        start = self._color or BLACK
+        self._target = target
+        self._color = tuple(color_command(target)["color"])
+        self.async_write_ha_state()
+        manager.async_start(
+            self._transition_key,
+            start,
+            target,
+            transition,
+            self._send_transition_frame,
+            lambda: frame_interval(self._scheduler.rtt),
+            complete,
+        )
+
+    @callback
+    def _async_send_optimistic(
+        self, request_data: dict[str, Any], color: tuple[float, ...] | None
+    ) -> None:
+        """Show a color at once and confirm the command setting it in the background."""
+        self._color = color
+        self._async_confirm(self._scheduler.submit("color", request_data))
+
+    async def _send_color(self, color: tuple[float, ...]) -> None:
+        """Send one color to HyperHDR."""
+        request_data = color_command(color)
+        if await self._scheduler.submit("color", request_data) is None:
+            return
+        self._color = tuple(request_data["color"])
+        self.async_write_ha_state()
+
+    async def _send_transition_frame(self, color: tuple[float, ...]) -> None:
+        """Send one color frame of a transition."""
+        await self._scheduler.submit("color", color_command(color))
+
+    async def _clear(self) -> None:
+        """Remove the color from HyperHDR."""
+        try:
+            await self._scheduler.submit("color", clear_command())
+        except HyperHDRError as error:
+            _LOGGER.error("Error clearing color: %s", error)
+            return
+        self._color = None
+        self.async_write_ha_state()
+
+    def _update_from_coordinator(self) -> None:
+        """Take the color from the latest serverinfo."""
+        if self.coordinator.data is None:
+            return
+        color = self.coordinator.data.get("color")
+        self._color = tuple(color) if color else None
+
+    def _published_state(self) -> tuple[Any, ...]:
+        """Return the values that make up the entity's state."""
+        return (self._color,)
@@ -1,26 +1,32 @@
 """Number platform for HyperHDR Control integration."""
 from __future__ import annotations
 
-import json
 import logging
 from typing import Any
-import asyncio
-from datetime import datetime, timedelta
 
-import aiohttp
-import async_timeout
+import voluptuous as vol
+
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT, PERCENTAGE
+from homeassistant.const import PERCENTAGE
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .api import HyperHDRError
+from .commands import brightness_command
+from .const import CONF_OPTIMISTIC, DOMAIN
+from .coordinator import HyperHDRCoordinator
+from .entity import HyperHDRCoordinatorEntity, HyperHDRInstanceInfo
+from .scheduler import HyperHDRCommandScheduler
+from .transitions import async_get_transition_manager, frame_interval
 
 _LOGGER = logging.getLogger(__name__)
 
-THROTTLE_DELAY = 1.0  # Delay in seconds between API calls
+ATTR_BRIGHTNESS = "brightness"
+ATTR_TRANSITION = "transition"
+
+SERVICE_TRANSITION_BRIGHTNESS = "transition_brightness"
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -28,23 +34,44 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the HyperHDR Control number entities."""
-    host = entry.data[CONF_HOST]
-    port = entry.data[CONF_PORT]
-    
     async_add_entities([
-        HyperHDRBrightnessNumber(entry.entry_id, host, port)
-    ], True)
+        HyperHDRBrightnessNumber(
+            runtime["coordinator"],
+            runtime["scheduler"],
+            runtime["info"],
+            entry.options.get(CONF_OPTIMISTIC, True),
+        )
+        for runtime in hass.data[DOMAIN][entry.entry_id]["instances"].values()
+    ])
 
-class HyperHDRBrightnessNumber(NumberEntity):
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_TRANSITION_BRIGHTNESS,
+        {
+            vol.Required(ATTR_BRIGHTNESS): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            vol.Optional(ATTR_TRANSITION, default=1): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=300)
+            ),
+        },
+        "async_transition",
+    )
+
+class HyperHDRBrightnessNumber(HyperHDRCoordinatorEntity, NumberEntity):
     """Representation of a HyperHDR brightness control."""
 
-    def __init__(self, entry_id: str, host: str, port: int) -> None:
+    def __init__(
+        self,
+        coordinator: HyperHDRCoordinator,
+        scheduler: HyperHDRCommandScheduler,
+        info: HyperHDRInstanceInfo,
+        optimistic: bool = True,
+    ) -> None:
         """Initialize the number entity."""
-        self._entry_id = entry_id
-        self._host = host
-        self._port = port
-        self._attr_name = "HyperHDR Brightness"
-        self._attr_unique_id = f"hyperhdr_brightness_{host}_{port}"
+        super().__init__(coordinator, info)
+        self._scheduler = scheduler
+        self._optimistic = optimistic
+        self._attr_name = info.entity_name("Brightness")
+        self._attr_unique_id = f"hyperhdr_brightness_{info.unique_id}"
         self._attr_native_min_value = 0
         self._attr_native_max_value = 100
         self._attr_native_step = 1
@@ -52,110 +79,69 @@ class HyperHDRBrightnessNumber(NumberEntity):
         self._attr_native_unit_of_measurement = PERCENTAGE
         self._attr_native_value = 100  # Set initial value
         self._attr_available = True  # Explicitly set availability
-        self._last_update = datetime.min
-        self._pending_value = None
-        self._update_lock = asyncio.Lock()
-        self._update_task = None
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information about this HyperHDR instance."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{self._host}:{self._port}")},
-            manufacturer="HyperHDR",
-            name=f"HyperHDR ({self._host})",
-            model="HyperHDR LED Controller",
-            sw_version="1.3.3",
-        )
+        self._transition_key = f"{info.entry_id}:{info.instance}:brightness"
+        self._update_from_coordinator()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self._attr_available
-
-    async def _delayed_update(self) -> None:
-        """Handle the delayed update of the brightness value."""
-        try:
-            while True:
-                async with self._update_lock:
-                    if self._pending_value is None:
-                        self._update_task = None
-                        return
-                    
-                    value = self._pending_value
-                    self._pending_value = None
-                
-                await self._set_brightness(value)
-                await asyncio.sleep(THROTTLE_DELAY)
-        except Exception as error:
-            _LOGGER.error("Error in delayed update: %s", error)
-            self._update_task = None
+        return super().available and self._attr_available
 
     async def async_set_native_value(self, value: float) -> None:
-        """Set the brightness value with throttling."""
-        async with self._update_lock:
-            self._pending_value = value
+        """Set the brightness value, coalescing rapid slider changes."""
+        async_get_transition_manager(self.hass).async_cancel(self._transition_key)
+        if self._optimistic:
             self._attr_native_value = value
-            
-            if self._update_task is None:
-                self._update_task = asyncio.create_task(self._delayed_update())
+            self._async_confirm(self._scheduler.submit("brightness", brightness_command(value)))
+            return
+
+        await self._set_brightness(value)
+        if self._attr_available:
+            self._attr_native_value = value
+        self.async_write_ha_state()
+
+    async def async_transition(self, brightness: float, transition: float) -> None:
+        """Fade to a brightness value over the given number of seconds."""
+        start = self._attr_native_value if self._attr_native_value is not None else brightness
+        self._attr_native_value = brightness
+        self.async_write_ha_state()
+        async_get_transition_manager(self.hass).async_start(
+            self._transition_key,
+            (float(start),),
+            (brightness,),
+            transition,
+            self._send_transition_frame,
+            lambda: frame_interval(self._scheduler.rtt),
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop a running transition."""
+        async_get_transition_manager(self.hass).async_cancel(self._transition_key)
+        await super().async_will_remove_from_hass()
+
+    async def _send_transition_frame(self, frame: tuple[float, ...]) -> None:
+        """Send one brightness frame of a transition."""
+        await self._scheduler.submit("brightness", brightness_command(frame[0]))
 
     async def _set_brightness(self, value: float) -> None:
         """Send the brightness value to HyperHDR."""
-        request_data = {
-            "command": "adjustment",
-            "adjustment": {
-                "classic_config": False,
-                "brightness": int(value)
-            }
-        }
-        
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"http://{self._host}:{self._port}/json-rpc"
-                params = {"request": json.dumps(request_data, separators=(',', ':'))}
-                _LOGGER.debug("Sending brightness request to %s with params: %s", url, params)
-                
-                async with async_timeout.timeout(10):
-                    async with session.get(url, params=params) as response:
-                        if response.status == 200:
-                            self._attr_available = True
-                        else:
-                            self._attr_available = False
-                            _LOGGER.error("Failed to set brightness: %s", response.status)
-                            response_text = await response.text()
-                            _LOGGER.error("Response: %s", response_text)
-        except (aiohttp.ClientError, TimeoutError) as error:
+            await self._scheduler.submit("brightness", brightness_command(value))
+        except HyperHDRError as error:
             self._attr_available = False
             _LOGGER.error("Error setting brightness: %s", error)
+        else:
+            self._attr_available = True
 
-    async def async_update(self) -> None:
-        """Update the current brightness value."""
-        request_data = {
-            "command": "serverinfo"
-        }
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                url = f"http://{self._host}:{self._port}/json-rpc"
-                params = {"request": json.dumps(request_data, separators=(',', ':'))}
-                
-                async with async_timeout.timeout(10):
-                    async with session.get(url, params=params) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            _LOGGER.debug("Received serverinfo response: %s", data)
-                            
-                            # Find the brightness in the adjustment array
-                            adjustments = data.get("info", {}).get("adjustment", [])
-                            if isinstance(adjustments, list) and adjustments:
-                                # Take the first adjustment's brightness value
-                                brightness = adjustments[0].get("brightness", 100)
-                                self._attr_native_value = float(brightness)
-                            
-                            self._attr_available = True
-                        else:
-                            self._attr_available = False
-        except (aiohttp.ClientError, TimeoutError) as error:
-            self._attr_available = False
-            _LOGGER.error("Error updating brightness: %s", error) 
\ No newline at end of file
+    def _update_from_coordinator(self) -> None:
+        """Take the brightness from the latest serverinfo."""
+        if self.coordinator.data is None:
+            return
+        brightness = self.coordinator.data["brightness"]
+        if brightness is not None:
+            self._attr_native_value = brightness
+        self._attr_available = True
+
+    def _published_state(self) -> tuple[Any, ...]:
+        """Return the values that make up the entity's state."""
+        return (self._attr_native_value,)
@@ -0,0 +1,216 @@
+"""Command scheduler for HyperHDR Control integration."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .api import HyperHDRClient
+
+_LOGGER = logging.getLogger(__name__)
+
+RTT_SMOOTHING = 0.2  # Weight of the newest sample in the round-trip average
+MAX_PACE = 1.0  # Upper bound in seconds between two sends of the same command
+MAX_CONCURRENT = 4  # Commands in flight to one host at the same time
+
+# Lower values are sent first
+PRIORITY_USER = 0
+PRIORITY_REFRESH = 10
+
+
+class _PrioritySemaphore:
+    """Semaphore that hands free permits to the waiter with the lowest priority value."""
+
+    def __init__(self, value: int) -> None:
+        """Initialize the semaphore."""
+        self._value = value
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    async def acquire(self, priority: int) -> None:
+        """Wait for a permit, ahead of every waiter with a higher priority value."""
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The permit was handed over just before the cancellation
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Return a permit, waking the most urgent waiter."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._value += 1
+
+
+class _Slot:
+    """Scheduling state for one command key."""
+
+    __slots__ = ("priority", "pending", "task", "next_send", "stats")
+
+    def __init__(self, priority: int) -> None:
+        """Initialize the slot."""
+        self.priority = priority
+        self.stats = {"submitted": 0, "sent": 0, "coalesced": 0, "failed": 0}
+        self.pending: tuple[dict[str, Any], asyncio.Future[dict[str, Any] | None]] | None = None
+        self.task: asyncio.Task[None] | None = None
+        self.next_send = 0.0
+
+
+class HyperHDRCommandScheduler:
+    """Coalesce and pace the commands sent to one HyperHDR host.
+
+    Commands are grouped by key (for example ``brightness`` or one key per
+    component). The first command for a key is sent immediately. Commands
+    submitted while one is in flight are coalesced so only the latest is
+    sent, once the host has had a smoothed round-trip time to absorb the
+    previous one.
+
+    At most ``MAX_CONCURRENT`` commands are in flight per host. When that
+    limit is reached, user commands are sent ahead of background refreshes,
+    and a queued command is dropped as stale if a newer one for the same key
+    arrives before it could be sent.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: HyperHDRClient, instance: int = 0) -> None:
+        """Initialize the scheduler for one LED instance of a host."""
+        self._hass = hass
+        self._client = client
+        self._instance = instance
+        self._slots: dict[str, _Slot] = {}
+        self._permits = _PrioritySemaphore(MAX_CONCURRENT)
+        self._rtt: float | None = None
+
+    @property
+    def rtt(self) -> float | None:
+        """Return the smoothed round-trip time in seconds."""
+        return self._rtt
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return counters of submitted, sent, coalesced and failed commands."""
+        totals = {"submitted": 0, "sent": 0, "coalesced": 0, "failed": 0}
+        for slot in self._slots.values():
+            for name, count in slot.stats.items():
+                totals[name] += count
+        return totals
+
+    def key_stats(self, key: str) -> dict[str, int] | None:
+        """Return the counters of one command key, or None if it was never used."""
+        if (slot := self._slots.get(key)) is None:
+            return None
+        return dict(slot.stats)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of commands waiting to be sent."""
+        return sum(slot.pending is not None for slot in self._slots.values())
+
+    async def submit(
+        self, key: str, command: dict[str, Any], priority: int = PRIORITY_USER
+    ) -> dict[str, Any] | None:
+        """Schedule a command and wait until it is sent.
+
+        Returns the response, or None when a newer command for the same key
+        replaced this one before it was sent.
+        """
+        slot = self._slots.setdefault(key, _Slot(priority))
+        slot.priority = priority
+        slot.stats["submitted"] += 1
+        future: asyncio.Future[dict[str, Any] | None] = (
+            asyncio.get_running_loop().create_future()
+        )
+
+        if slot.pending is not None:
+            _, superseded = slot.pending
+            if not superseded.done():
+                superseded.set_result(None)
+            slot.stats["coalesced"] += 1
+        slot.pending = (command, future)
+
+        if slot.task is None:
+            slot.task = self._hass.async_create_background_task(
+                self._drain(slot), f"hyperhdr {self._client.host} {self._instance} {key}"
+            )
+        return await future
+
+    async def _drain(self, slot: _Slot) -> None:
+        """Send the latest pending command of a slot until none is left."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[dict[str, Any] | None] | None = None
+        try:
+            while slot.pending is not None:
+                delay = slot.next_send - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                # Take the command only once a permit is granted, so anything
+                # submitted while waiting replaces it instead of queueing behind it
+                await self._permits.acquire(slot.priority)
+                try:
+                    command, future = slot.pending
+                    slot.pending = None
+                    started = loop.time()
+                    try:
+                        response = await self._client.send(command, self._instance)
+                    except Exception as error:
+                        # Any failure belongs to the caller, not the drain task
+                        slot.stats["failed"] += 1
+                        if not future.done():
+                            future.set_exception(error)
+                    else:
+                        slot.stats["sent"] += 1
+                        if slot.priority == PRIORITY_USER:
+                            # Refresh payloads are large and would skew the pacing
+                            self._record_rtt(loop.time() - started)
+                        if not future.done():
+                            future.set_result(response)
+                finally:
+                    self._permits.release()
+
+                # Paced from the start of the send, so a slow answer does not
+                # add its own duration to the gap
+                slot.next_send = started + self._pace
+        finally:
+            slot.task = None
+            # Release callers if the scheduler is torn down mid-send
+            if future is not None:
+                future.cancel()
+            if slot.pending is not None:
+                slot.pending[1].cancel()
+                slot.pending = None
+
+    async def async_shutdown(self) -> None:
+        """Cancel the pending commands and wait for the drain tasks to end."""
+        tasks = [slot.task for slot in self._slots.values() if slot.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @property
+    def _pace(self) -> float:
+        """Return the minimum gap between two sends of the same key."""
+        if self._rtt is None:
+            return 0.0
+        return min(self._rtt, MAX_PACE)
+
+    def _record_rtt(self, sample: float) -> None:
+        """Fold a round-trip sample into the smoothed average."""
+        if self._rtt is None:
+            self._rtt = sample
+        else:
+            self._rtt += RTT_SMOOTHING * (sample - self._rtt)
@@ -0,0 +1,297 @@
+"""Sensor platform for HyperHDR Control integration."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, EDGES
+from .coordinator import HyperHDRCoordinator
+from .entity import HyperHDRInstanceInfo
+from .scheduler import HyperHDRCommandScheduler
+
+if TYPE_CHECKING:
+    from .analytics import HyperHDRLedAnalytics
+from .stats import HyperHDRStats
+
+_LOGGER = logging.getLogger(__name__)
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+COLOR_THRESHOLD = 8  # Change of any RGB channel, 0-255, before a color is written
+LUMINANCE_THRESHOLD = 1.0  # Change in percentage points before luminance is written
+
+
+@dataclass(frozen=True)
+class _PerformanceSource:
+    """Everything a performance sensor can read from."""
+
+    scheduler: HyperHDRCommandScheduler
+    stats: HyperHDRStats
+    coordinator: HyperHDRCoordinator
+
+
+def _coalescing_ratio(source: _PerformanceSource) -> float | None:
+    """Return the share of brightness changes that were never sent."""
+    key_stats = source.scheduler.key_stats("brightness")
+    if not key_stats or not key_stats["submitted"]:
+        return None
+    return round(key_stats["coalesced"] / key_stats["submitted"] * 100, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class HyperHDRPerformanceSensorDescription(SensorEntityDescription):
+    """Describe a HyperHDR performance sensor."""
+
+    value_fn: Callable[[_PerformanceSource], float | int | None]
+
+
+PERFORMANCE_SENSORS = (
+    HyperHDRPerformanceSensorDescription(
+        key="command_latency",
+        name="HyperHDR Command Latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda source: source.stats.mean_latency_ms,
+    ),
+    HyperHDRPerformanceSensorDescription(
+        key="command_latency_p50",
+        name="HyperHDR Command Latency p50",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda source: source.stats.latency_quantile_ms(0.5),
+    ),
+    HyperHDRPerformanceSensorDescription(
+        key="command_latency_p99",
+        name="HyperHDR Command Latency p99",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda source: source.stats.latency_quantile_ms(0.99),
+    ),
+    HyperHDRPerformanceSensorDescription(
+        key="request_timeouts",
+        name="HyperHDR Request Timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda source: source.stats.timeouts,
+    ),
+    HyperHDRPerformanceSensorDescription(
+        key="http_errors",
+        name="HyperHDR HTTP Errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda source: source.stats.http_errors,
+    ),
+    HyperHDRPerformanceSensorDescription(
+        key="serverinfo_size",
+        name="HyperHDR Serverinfo Size",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda source: source.stats.serverinfo_bytes,
+    ),
+    HyperHDRPerformanceSensorDescription(
+        key="serverinfo_parse_time",
+        name="HyperHDR Serverinfo Parse Time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda source: source.stats.serverinfo_parse_ms,
+    ),
+    HyperHDRPerformanceSensorDescription(
+        key="queue_depth",
+        name="HyperHDR Command Queue Depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda source: source.scheduler.queue_depth,
+    ),
+    HyperHDRPerformanceSensorDescription(
+        key="brightness_coalescing",
+        name="HyperHDR Brightness Coalescing Ratio",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_coalescing_ratio,
+    ),
+    HyperHDRPerformanceSensorDescription(
+        key="suppressed_writes",
+        name="HyperHDR Suppressed State Writes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda source: source.coordinator.suppressed_writes,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class HyperHDRAmbientSensorDescription(SensorEntityDescription):
+    """Describe a HyperHDR ambient color sensor."""
+
+    value_fn: Callable[[dict[str, Any]], tuple[int, int, int] | float | None]
+    threshold: float
+
+
+AMBIENT_SENSORS = (
+    HyperHDRAmbientSensorDescription(
+        key="dominant_color",
+        name="HyperHDR Dominant Color",
+        icon="mdi:palette",
+        value_fn=lambda reading: reading["dominant_color"],
+        threshold=COLOR_THRESHOLD,
+    ),
+    HyperHDRAmbientSensorDescription(
+        key="luminance",
+        name="HyperHDR Average Luminance",
+        icon="mdi:brightness-6",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda reading: reading["luminance"],
+        threshold=LUMINANCE_THRESHOLD,
+    ),
+    *(
+        HyperHDRAmbientSensorDescription(
+            key=f"{edge}_color",
+            name=f"HyperHDR {edge.capitalize()} Edge Color",
+            icon="mdi:border-all-variant",
+            value_fn=lambda reading, edge=edge: reading["edges"][edge],
+            threshold=COLOR_THRESHOLD,
+        )
+        for edge in EDGES
+    ),
+)
+
+
+def _exceeds_threshold(
+    old: tuple[int, int, int] | float | None,
+    new: tuple[int, int, int] | float | None,
+    threshold: float,
+) -> bool:
+    """Return True if a value moved further than the threshold."""
+    if old is None or new is None:
+        return old != new
+    if isinstance(new, tuple):
+        return max(abs(a - b) for a, b in zip(old, new)) > threshold
+    return abs(new - old) > threshold
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the HyperHDR Control sensors."""
+    client = hass.data[DOMAIN][entry.entry_id]["client"]
+    info = hass.data[DOMAIN][entry.entry_id]["instances"][0]["info"]
+
+    entities: list[SensorEntity] = []
+    if client.stats is not None:
+        source = _PerformanceSource(
+            hass.data[DOMAIN][entry.entry_id]["scheduler"],
+            client.stats,
+            hass.data[DOMAIN][entry.entry_id]["coordinator"],
+        )
+        entities.extend(
+            HyperHDRPerformanceSensor(source, description, info)
+            for description in PERFORMANCE_SENSORS
+        )
+
+    analytics = hass.data[DOMAIN][entry.entry_id]["analytics"]
+    if analytics is not None:
+        entities.extend(
+            HyperHDRAmbientSensor(analytics, description, info)
+            for description in AMBIENT_SENSORS
+        )
+
+    async_add_entities(entities)
+
+
+class HyperHDRPerformanceSensor(SensorEntity):
+    """Diagnostic sensor reporting request statistics of a HyperHDR host."""
+
+    entity_description: HyperHDRPerformanceSensorDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        source: _PerformanceSource,
+        description: HyperHDRPerformanceSensorDescription,
+        info: HyperHDRInstanceInfo,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._source = source
+        self._attr_unique_id = f"hyperhdr_{description.key}_{info.unique_id}"
+        self._attr_device_info = info.device_info
+
+    async def async_update(self) -> None:
+        """Read the latest statistics."""
+        self._attr_native_value = self.entity_description.value_fn(self._source)
+
+
+class HyperHDRAmbientSensor(SensorEntity):
+    """Ambient color reading derived from the LED color stream.
+
+    Readings arrive several times per second; state is only written when
+    the value moved further than the description's threshold.
+    """
+
+    entity_description: HyperHDRAmbientSensorDescription
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        analytics: HyperHDRLedAnalytics,
+        description: HyperHDRAmbientSensorDescription,
+        info: HyperHDRInstanceInfo,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._analytics = analytics
+        self._attr_unique_id = f"hyperhdr_{description.key}_{info.unique_id}"
+        self._attr_device_info = info.device_info
+        self._value: tuple[int, int, int] | float | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return True once the stream produced a value for this sensor."""
+        return self._value is not None
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the readings of the analytics."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._analytics.add_listener(self._handle_reading))
+
+    @callback
+    def _handle_reading(self) -> None:
+        """Write state if the new reading moved beyond the threshold."""
+        value = self.entity_description.value_fn(self._analytics.reading)
+        if not _exceeds_threshold(self._value, value, self.entity_description.threshold):
+            return
+
+        self._value = value
+        if isinstance(value, tuple):
+            self._attr_native_value = "#{:02x}{:02x}{:02x}".format(*value)
+            self._attr_extra_state_attributes = {"rgb_color": list(value)}
+        else:
+            self._attr_native_value = value
+        self.async_write_ha_state()
@@ -0,0 +1,151 @@
+"""Services for HyperHDR Control integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.helpers import config_validation as cv
+
+from .api import HyperHDRError
+from .commands import brightness_command, component_command, component_key, effect_command
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_GROUP_CONTROL = "group_control"
+SERVICE_STREAM_COLOR = "stream_color"
+
+ATTR_CONFIG_ENTRY_IDS = "config_entry_ids"
+ATTR_EFFECT = "effect"
+ATTR_COMPONENTS = "components"
+ATTR_BRIGHTNESS = "brightness"
+ATTR_MAX_CONCURRENT = "max_concurrent"
+ATTR_TIMEOUT = "timeout"
+ATTR_RGB_COLOR = "rgb_color"
+
+DEFAULT_MAX_CONCURRENT = 8  # Hosts commanded at the same time
+DEFAULT_TIMEOUT = 10  # Seconds for the whole group
+
+GROUP_CONTROL_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_CONFIG_ENTRY_IDS): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(ATTR_EFFECT): cv.string,
+            vol.Optional(ATTR_COMPONENTS): {vol.All(cv.string, vol.Upper): cv.boolean},
+            vol.Optional(ATTR_BRIGHTNESS): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            vol.Optional(ATTR_MAX_CONCURRENT, default=DEFAULT_MAX_CONCURRENT): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=100)
+            ),
+            vol.Optional(ATTR_TIMEOUT, default=DEFAULT_TIMEOUT): vol.All(
+                vol.Coerce(float), vol.Range(min=1, max=300)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_EFFECT, ATTR_COMPONENTS, ATTR_BRIGHTNESS),
+)
+
+STREAM_COLOR_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_IDS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_RGB_COLOR): vol.All(
+            vol.ExactSequence((cv.byte, cv.byte, cv.byte)), vol.Coerce(tuple)
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_group_control(call: ServiceCall) -> ServiceResponse:
+        """Apply one payload to many HyperHDR servers concurrently."""
+        limit = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENT])
+
+        async def control(entry_id: str) -> None:
+            async with limit:
+                await _async_control_host(hass, entry_id, call.data)
+
+        entry_ids = list(dict.fromkeys(call.data[ATTR_CONFIG_ENTRY_IDS]))
+        tasks = {
+            entry_id: hass.async_create_task(control(entry_id), f"{DOMAIN} group {entry_id}")
+            for entry_id in entry_ids
+        }
+        _, pending = await asyncio.wait(tasks.values(), timeout=call.data[ATTR_TIMEOUT])
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+        results: dict[str, Any] = {}
+        for entry_id, task in tasks.items():
+            entry = hass.config_entries.async_get_entry(entry_id)
+            result: dict[str, Any] = {"title": entry.title if entry else None}
+            if task.cancelled():
+                result.update(success=False, error="Deadline exceeded")
+            elif (error := task.exception()) is not None:
+                result.update(success=False, error=str(error))
+            else:
+                result.update(success=True)
+            results[entry_id] = result
+
+        failed = [entry_id for entry_id, result in results.items() if not result["success"]]
+        if failed:
+            _LOGGER.warning("Group control failed on %d of %d hosts", len(failed), len(results))
+        return {"results": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GROUP_CONTROL,
+        async_group_control,
+        schema=GROUP_CONTROL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_stream_color(call: ServiceCall) -> ServiceResponse:
+        """Send a color frame over the FlatBuffers stream of each host."""
+        results: dict[str, Any] = {}
+        for entry_id in dict.fromkeys(call.data[ATTR_CONFIG_ENTRY_IDS]):
+            if (entry_data := hass.data.get(DOMAIN, {}).get(entry_id)) is None:
+                results[entry_id] = {"sent": False, "error": "Config entry is not loaded"}
+                continue
+            # A dropped frame is not an error: the host is still busy with an
+            # earlier one and the next frame will get through
+            results[entry_id] = {"sent": entry_data["stream"].send_color(call.data[ATTR_RGB_COLOR])}
+        return {"results": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STREAM_COLOR,
+        async_stream_color,
+        schema=STREAM_COLOR_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def _async_control_host(hass: HomeAssistant, entry_id: str, data: dict[str, Any]) -> None:
+    """Send the commands of a group payload to one host."""
+    if (entry_data := hass.data.get(DOMAIN, {}).get(entry_id)) is None:
+        raise HyperHDRError("Config entry is not loaded")
+    scheduler = entry_data["scheduler"]
+
+    # Components first, so an effect is not started on a disabled LED device
+    await asyncio.gather(
+        *(
+            scheduler.submit(component_key(component), component_command(component, state))
+            for component, state in data.get(ATTR_COMPONENTS, {}).items()
+        )
+    )
+    commands = []
+    if ATTR_BRIGHTNESS in data:
+        commands.append(scheduler.submit("brightness", brightness_command(data[ATTR_BRIGHTNESS])))
+    if ATTR_EFFECT in data:
+        commands.append(scheduler.submit("effect", effect_command(data[ATTR_EFFECT])))
+    await asyncio.gather(*commands)
+
+    # Without push updates the entities only learn the new state on a refresh
+    if not entry_data["connection"].connected:
+        await entry_data["coordinator"].async_request_refresh()
@@ -0,0 +1,120 @@
+"""Request statistics for HyperHDR Control integration."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Histogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Add one sample."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding the given quantile."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else float("inf")
+        return float("inf")
+
+    def quantile_ms(self, fraction: float) -> float | None:
+        """Return a quantile in milliseconds, or None past the last bucket."""
+        seconds = self.quantile(fraction)
+        if seconds is None or seconds == float("inf"):
+            return None
+        return seconds * 1000
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as plain data."""
+        buckets = {f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 2) if self.count else None,
+            "p50_ms": self.quantile_ms(0.5),
+            "p99_ms": self.quantile_ms(0.99),
+            "buckets": buckets,
+        }
+
+
+class HyperHDRStats:
+    """Collect latency and error statistics of the requests to one host.
+
+    Only created when performance statistics are enabled in the options; the
+    request path skips every measurement when no instance is attached.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.latency: defaultdict[str, _Histogram] = defaultdict(_Histogram)
+        self.timeouts = 0
+        self.http_errors = 0
+        self.serverinfo_bytes: int | None = None
+        self.serverinfo_parse_ms: float | None = None
+
+    @property
+    def mean_latency_ms(self) -> float | None:
+        """Return the mean latency over all commands in milliseconds."""
+        count = sum(histogram.count for histogram in self.latency.values())
+        if not count:
+            return None
+        return sum(histogram.total for histogram in self.latency.values()) / count * 1000
+
+    def latency_quantile_ms(self, fraction: float) -> float | None:
+        """Return a latency quantile over all commands in milliseconds.
+
+        The value is the upper bound of the histogram bucket holding it.
+        """
+        merged = _Histogram()
+        for histogram in self.latency.values():
+            merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+            merged.count += histogram.count
+        return merged.quantile_ms(fraction)
+
+    def record_request(self, command: str, seconds: float) -> None:
+        """Record the latency of a successful request."""
+        self.latency[command].observe(seconds)
+
+    def record_timeout(self) -> None:
+        """Record a request that timed out."""
+        self.timeouts += 1
+
+    def record_http_error(self) -> None:
+        """Record an HTTP response with a status other than 200."""
+        self.http_errors += 1
+
+    def record_serverinfo(self, size: int, parse_seconds: float) -> None:
+        """Record the size and parse time of a serverinfo payload."""
+        self.serverinfo_bytes = size
+        self.serverinfo_parse_ms = parse_seconds * 1000
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as plain data."""
+        return {
+            "latency": {command: histogram.as_dict() for command, histogram in self.latency.items()},
+            "timeouts": self.timeouts,
+            "http_errors": self.http_errors,
+            "serverinfo_bytes": self.serverinfo_bytes,
+            "serverinfo_parse_ms": self.serverinfo_parse_ms,
+        }
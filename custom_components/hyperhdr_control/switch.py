@@ -1,21 +1,20 @@
 """Switch platform for HyperHDR Control integration."""
 from __future__ import annotations
 
-import json
 import logging
 from typing import Any
-from urllib.parse import urlencode
 
-import aiohttp
-import async_timeout
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .api import HyperHDRError
+from .commands import component_command, component_key
+from .const import CONF_OPTIMISTIC, DOMAIN
+from .coordinator import HyperHDRCoordinator
+from .entity import HyperHDRCoordinatorEntity, HyperHDRInstanceInfo
+from .scheduler import HyperHDRCommandScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,37 +28,44 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the HyperHDR Control switches."""
-    host = entry.data[CONF_HOST]
-    port = entry.data[CONF_PORT]
-    
-    async_add_entities([
-        HyperHDRSwitch(entry.entry_id, host, port, COMP_VIDEOGRABBER, "USB Capture"),
-        HyperHDRSwitch(entry.entry_id, host, port, COMP_LEDDEVICE, "LED Output")
-    ], True)
-
-class HyperHDRSwitch(SwitchEntity):
+    optimistic = entry.options.get(CONF_OPTIMISTIC, True)
+    entities = []
+    for runtime in hass.data[DOMAIN][entry.entry_id]["instances"].values():
+        coordinator = runtime["coordinator"]
+        scheduler = runtime["scheduler"]
+        info = runtime["info"]
+        entities += [
+            HyperHDRSwitch(
+                coordinator, scheduler, info, COMP_VIDEOGRABBER, "USB Capture", optimistic
+            ),
+            HyperHDRSwitch(
+                coordinator, scheduler, info, COMP_LEDDEVICE, "LED Output", optimistic
+            ),
+        ]
+
+    async_add_entities(entities)
+
+class HyperHDRSwitch(HyperHDRCoordinatorEntity, SwitchEntity):
     """Representation of a HyperHDR Control switch."""
 
-    def __init__(self, entry_id: str, host: str, port: int, component: str, name: str) -> None:
+    def __init__(
+        self,
+        coordinator: HyperHDRCoordinator,
+        scheduler: HyperHDRCommandScheduler,
+        info: HyperHDRInstanceInfo,
+        component: str,
+        name: str,
+        optimistic: bool = True,
+    ) -> None:
         """Initialize the switch."""
-        self._entry_id = entry_id
-        self._host = host
-        self._port = port
+        super().__init__(coordinator, info)
+        self._scheduler = scheduler
+        self._optimistic = optimistic
         self._component = component
-        self._attr_name = f"HyperHDR {name}"
-        self._attr_unique_id = f"hyperhdr_{component.lower()}_{host}_{port}"
+        self._attr_name = info.entity_name(name)
+        self._attr_unique_id = f"hyperhdr_{component.lower()}_{info.unique_id}"
         self._attr_is_on = False
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information about this HyperHDR instance."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{self._host}:{self._port}")},
-            manufacturer="HyperHDR",
-            name=f"HyperHDR ({self._host})",
-            model="HyperHDR LED Controller",
-            sw_version="1.3.3",
-        )
+        self._update_from_coordinator()
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
@@ -71,51 +77,36 @@ class HyperHDRSwitch(SwitchEntity):
 
     async def _set_state(self, state: bool) -> None:
         """Set the state of the component."""
-        request_data = {
-            "command": "componentstate",
-            "componentstate": {
-                "component": self._component,
-                "state": state
-            }
-        }
-        
+        command = self._scheduler.submit(
+            component_key(self._component), component_command(self._component, state)
+        )
+        if self._optimistic:
+            self._attr_is_on = state
+            self._async_confirm(command)
+            return
+
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"http://{self._host}:{self._port}/json-rpc"
-                params = {"request": json.dumps(request_data, separators=(',', ':'))}
-                _LOGGER.debug("Sending request to %s with params: %s", url, params)
-                
-                async with async_timeout.timeout(10):
-                    async with session.get(url, params=params) as response:
-                        if response.status == 200:
-                            self._attr_is_on = state
-                            _LOGGER.debug("Successfully set %s state to %s", self._component, state)
-                        else:
-                            _LOGGER.error("Failed to set state for %s: %s", self._component, response.status)
-                            response_text = await response.text()
-                            _LOGGER.error("Response: %s", response_text)
-        except (aiohttp.ClientError, TimeoutError) as error:
+            response = await command
+        except HyperHDRError as error:
             _LOGGER.error("Error setting state for %s: %s", self._component, error)
+            return
 
-    async def async_update(self) -> None:
-        """Update the state of the switch."""
-        request_data = {
-            "command": "serverinfo"
-        }
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                url = f"http://{self._host}:{self._port}/json-rpc"
-                params = {"request": json.dumps(request_data, separators=(',', ':'))}
-                
-                async with async_timeout.timeout(10):
-                    async with session.get(url, params=params) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            components = data.get("info", {}).get("components", [])
-                            for component in components:
-                                if component.get("name") == self._component:
-                                    self._attr_is_on = component.get("enabled", False)
-                                    break
-        except (aiohttp.ClientError, TimeoutError) as error:
-            _LOGGER.error("Error updating state: %s", error) 
\ No newline at end of file
+        if response is None:
+            # A newer toggle replaced this one before it was sent
+            return
+
+        self._attr_is_on = state
+        self.async_write_ha_state()
+        _LOGGER.debug("Successfully set %s state to %s", self._component, state)
+
+    def _update_from_coordinator(self) -> None:
+        """Take the component state from the latest serverinfo."""
+        if self.coordinator.data is None:
+            return
+        enabled = self.coordinator.data["components"].get(self._component)
+        if enabled is not None:
+            self._attr_is_on = enabled
+
+    def _published_state(self) -> tuple[Any, ...]:
+        """Return the values that make up the entity's state."""
+        return (self._attr_is_on,)
@@ -0,0 +1,191 @@
+"""Client-side transitions for HyperHDR Control integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import HyperHDRError
+from .const import DATA_TRANSITIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+MIN_FRAME_INTERVAL = 1 / 30  # Never send frames faster than this, in seconds
+MAX_FRAME_INTERVAL = 0.5  # Send at least this often, however slow the host
+DEFAULT_FRAME_INTERVAL = 0.1  # Used until a round-trip time was measured
+
+
+def ease_in_out(progress: float) -> float:
+    """Cubic ease-in-out curve mapping 0..1 onto 0..1."""
+    if progress < 0.5:
+        return 4 * progress**3
+    return 1 - (-2 * progress + 2) ** 3 / 2
+
+
+def frame_interval(rtt: float | None) -> float:
+    """Return the time between two frames a host with this round-trip time can absorb."""
+    if rtt is None:
+        return DEFAULT_FRAME_INTERVAL
+    return min(MAX_FRAME_INTERVAL, max(MIN_FRAME_INTERVAL, rtt))
+
+
+class _Transition:
+    """One running transition."""
+
+    __slots__ = (
+        "start",
+        "target",
+        "started",
+        "duration",
+        "send",
+        "pace",
+        "on_complete",
+        "next_frame",
+        "in_flight",
+        "final",
+    )
+
+    def __init__(
+        self,
+        start: tuple[float, ...],
+        target: tuple[float, ...],
+        started: float,
+        duration: float,
+        send: Callable[[tuple[float, ...]], Awaitable[Any]],
+        pace: Callable[[], float],
+        on_complete: Callable[[], Awaitable[Any]] | None,
+    ) -> None:
+        """Initialize the transition."""
+        self.start = start
+        self.target = target
+        self.started = started
+        self.duration = duration
+        self.send = send
+        self.pace = pace
+        self.on_complete = on_complete
+        self.next_frame = started
+        self.in_flight = False
+        self.final = False
+
+    def value_at(self, now: float) -> tuple[float, ...]:
+        """Return the eased value at a point in time, flagging the final frame."""
+        progress = (now - self.started) / self.duration if self.duration > 0 else 1.0
+        if progress >= 1:
+            self.final = True
+            return self.target
+        eased = ease_in_out(progress)
+        return tuple(
+            start + (target - start) * eased for start, target in zip(self.start, self.target)
+        )
+
+
+class HyperHDRTransitionManager:
+    """Run every transition of every host from a single timer.
+
+    A transition interpolates from a start to a target value on an easing
+    curve and hands each intermediate frame to its ``send`` coroutine. The
+    frame rate follows the host: ``pace`` returns the interval between
+    frames, and no frame is sent while the previous one is still in flight.
+    Starting a transition for a key that already has one cancels the
+    running one, so the newest target always wins.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the manager."""
+        self._hass = hass
+        self._transitions: dict[str, _Transition] = {}
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def active(self) -> int:
+        """Return the number of running transitions."""
+        return len(self._transitions)
+
+    @callback
+    def async_start(
+        self,
+        key: str,
+        start: tuple[float, ...],
+        target: tuple[float, ...],
+        duration: float,
+        send: Callable[[tuple[float, ...]], Awaitable[Any]],
+        pace: Callable[[], float],
+        on_complete: Callable[[], Awaitable[Any]] | None = None,
+    ) -> None:
+        """Start a transition, replacing the one running for the same key."""
+        self._transitions[key] = _Transition(
+            start, target, self._hass.loop.time(), duration, send, pace, on_complete
+        )
+        self._schedule()
+
+    @callback
+    def async_cancel(self, key: str) -> None:
+        """Stop the transition running for a key, if any."""
+        if self._transitions.pop(key, None) is not None:
+            self._schedule()
+
+    @callback
+    def _schedule(self) -> None:
+        """Arm the timer for the earliest frame that is due."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        due = [
+            transition.next_frame
+            for transition in self._transitions.values()
+            if not transition.in_flight
+        ]
+        if due:
+            self._timer = self._hass.loop.call_at(min(due), self._tick)
+
+    @callback
+    def _tick(self) -> None:
+        """Send a frame for every transition that is due."""
+        self._timer = None
+        now = self._hass.loop.time()
+        for key, transition in self._transitions.items():
+            if transition.in_flight or transition.next_frame > now:
+                continue
+            transition.in_flight = True
+            transition.next_frame = now + transition.pace()
+            self._hass.async_create_background_task(
+                self._async_send(key, transition, transition.value_at(now)),
+                f"hyperhdr transition {key}",
+            )
+        self._schedule()
+
+    async def _async_send(
+        self, key: str, transition: _Transition, value: tuple[float, ...]
+    ) -> None:
+        """Send one frame and retire the transition after its last one."""
+        try:
+            await transition.send(value)
+        except HyperHDRError as error:
+            _LOGGER.warning("Transition %s aborted: %s", key, error)
+            if self._transitions.get(key) is transition:
+                del self._transitions[key]
+            return
+        finally:
+            transition.in_flight = False
+
+        if self._transitions.get(key) is not transition:
+            return
+        if transition.final:
+            del self._transitions[key]
+            if transition.on_complete is not None:
+                try:
+                    await transition.on_complete()
+                except HyperHDRError as error:
+                    _LOGGER.debug("Completing transition %s failed: %s", key, error)
+        self._schedule()
+
+
+@callback
+def async_get_transition_manager(hass: HomeAssistant) -> HyperHDRTransitionManager:
+    """Return the transition manager shared by all config entries."""
+    if (manager := hass.data.get(DATA_TRANSITIONS)) is None:
+        manager = hass.data[DATA_TRANSITIONS] = HyperHDRTransitionManager(hass)
+    return manager